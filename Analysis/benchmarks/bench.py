@@ -0,0 +1,143 @@
+"""Pipeline benchmarks on generated data (see generate.py).
+
+Times every import stage and every chart/report method of TimeManagement for
+each data size and writes the results to results/<date>-<rev>.json. With
+--compare the run is checked against an earlier result file and stages that
+got slower by more than --threshold are reported (exit code 1).
+
+  python bench.py --sizes 10000,1000000,10000000
+  python bench.py --sizes 10000 --compare results/2026-10-01-abc1234.json
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+import datetime as DT
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from generate import write_dataset
+from time_management2 import TimeManagement
+
+DATA_DIR = os.path.join(HERE, ".data")
+RESULTS_DIR = os.path.join(HERE, "results")
+
+
+def _dataset(rows, years, seed):
+  """Root of a generated dataset, reused across runs."""
+  root = os.path.join(DATA_DIR, f"rows-{rows}-years-{years:g}-seed-{seed}")
+  if not os.path.exists(os.path.join(root, "data", "applications.csv")):
+    print(f"generating {rows} rows ...", file=sys.stderr)
+    write_dataset(root, rows, years, seed=seed)
+  return root
+
+
+def _timed(results, name, fn, *args, **kwargs):
+  wall, cpu = time.perf_counter(), time.process_time()
+  entry = {}
+  try:
+    out = fn(*args, **kwargs)
+  except Exception as exc:  # keep benchmarking the other stages
+    out = None
+    entry["error"] = f"{type(exc).__name__}: {exc}"
+  entry["wall_s"] = round(time.perf_counter() - wall, 4)
+  entry["cpu_s"] = round(time.process_time() - cpu, 4)
+  results[name] = entry
+  plt.close("all")
+  return out
+
+
+def bench_size(rows, years=3.0, seed=0):
+  root = _dataset(rows, years, seed)
+  out_dir = tempfile.mkdtemp(prefix="tm-bench-")
+  tm = TimeManagement(600, root, out_dir, export=False, use_cache=False)
+  stages = {}
+
+  app, process_tags = _timed(stages, "load_files", tm.load_files)
+  app = _timed(stages, "parse_titles", tm.parse_titles, app)
+  process_tags = _timed(stages, "tagging", tm.tagging, app, process_tags)
+  app = _timed(stages, "merge_tags", tm.merge_tags, app, process_tags)
+  app = _timed(stages, "create_effective_day", tm.create_effective_day, app)
+  _timed(stages, "aggregate", tm._set_app, app)
+
+  td = tm.app.Effective_Day.max().date()
+  _timed(stages, "pie_chart", tm.pie_chart, tm.app, td)
+  _timed(stages, "line_chart", tm.line_chart, tm.app, td)
+  _timed(stages, "bar_chart", tm.bar_chart, tm.app, td - DT.timedelta(days=7), td)
+  _timed(stages, "three_week_summary", tm.three_week_summary, td)
+  _timed(stages, "month_view", tm.month_view, td.month)
+  _timed(stages, "summary", tm.summary, td)
+  _timed(stages, "week_summary", tm.week_summary, td)
+  _timed(stages, "all_time_rebuild", tm.all_time, rebuild=True)
+  _timed(stages, "all_time", tm.all_time)
+  return {"rows": rows, "years": years, "seed": seed, "stages": stages}
+
+
+def _meta():
+  try:
+    rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                         capture_output=True, text=True).stdout.strip()
+  except OSError:
+    rev = ""
+  return {"date": DT.datetime.now().isoformat(timespec="seconds"), "git_rev": rev,
+          "python": platform.python_version(), "pandas": pd.__version__,
+          "numpy": np.__version__, "matplotlib": matplotlib.__version__,
+          "platform": platform.platform(), "cpu_count": os.cpu_count()}
+
+
+def compare(current, baseline, threshold=0.2):
+  """Print per-stage ratios against baseline; return the regressed (size, stage) pairs."""
+  regressed = []
+  for size, run in current["results"].items():
+    base = baseline["results"].get(size)
+    if base is None:
+      continue
+    for stage, entry in run["stages"].items():
+      old = base["stages"].get(stage, {}).get("wall_s")
+      if not old or "error" in entry:
+        continue
+      ratio = entry["wall_s"] / old
+      flag = " <-- slower" if ratio > 1 + threshold else ""
+      print(f"{size:>10} {stage:<22} {old:>9.3f}s -> {entry['wall_s']:>9.3f}s  x{ratio:.2f}{flag}")
+      if flag:
+        regressed.append((size, stage))
+  return regressed
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--sizes", default="10000,1000000,10000000")
+  parser.add_argument("--years", type=float, default=3.0)
+  parser.add_argument("--seed", type=int, default=0)
+  parser.add_argument("--out", default=None, help="result file, default results/<date>-<rev>.json")
+  parser.add_argument("--compare", default=None, help="earlier result file to compare against")
+  parser.add_argument("--threshold", type=float, default=0.2)
+  args = parser.parse_args()
+
+  report = {"meta": _meta(), "results": {}}
+  for rows in (int(s) for s in args.sizes.split(",")):
+    run = bench_size(rows, args.years, args.seed)
+    report["results"][str(rows)] = run
+    for stage, entry in run["stages"].items():
+      print(f"{rows:>10} {stage:<22} {entry['wall_s']:>9.3f}s {entry.get('error', '')}")
+
+  out = args.out or os.path.join(RESULTS_DIR, f"{DT.date.today()}-{report['meta']['git_rev'] or 'norev'}.json")
+  os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+  with open(out, "w", encoding="utf-8") as fh:
+    json.dump(report, fh, indent=2)
+  print(f"results written to {out}")
+
+  if args.compare:
+    with open(args.compare, "r", encoding="utf-8") as fh:
+      baseline = json.load(fh)
+    sys.exit(1 if compare(report, baseline, args.threshold) else 0)
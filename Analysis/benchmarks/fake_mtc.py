@@ -0,0 +1,41 @@
+"""Stand-in for the ManicTime mtc CLI, serving rows of an existing export.
+
+Understands `export ManicTime/Applications <out.csv> [/fd:YYYY-MM-DD] [/td:YYYY-MM-DD]`
+and writes the rows of --source whose Start falls on fd..td. --delay and
+--fail-rate imitate a slow or flaky mtc for backfill benchmarks and tests:
+
+  tm = TimeManagement(..., mtc=[sys.executable, "fake_mtc.py", "--source", csv])
+"""
+import sys
+import time
+import random
+import argparse
+import pandas as pd
+
+
+def export(source, out_path, fd=None, td=None):
+  app = pd.read_csv(source, dtype=str, keep_default_na=False)
+  day = app["Start"].str[:10]
+  keep = pd.Series(True, index=app.index)
+  if fd is not None:
+    keep &= day >= fd
+  if td is not None:
+    keep &= day <= td
+  app[keep].to_csv(out_path, index=False)
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--source", required=True, help="applications.csv to serve")
+  parser.add_argument("--delay", type=float, default=0.0, help="seconds per call")
+  parser.add_argument("--fail-rate", type=float, default=0.0, help="probability of exiting with an error")
+  parser.add_argument("command", nargs="+")
+  args = parser.parse_args()
+
+  if args.command[:2] != ["export", "ManicTime/Applications"] or len(args.command) < 3:
+    sys.exit(f"unsupported command: {' '.join(args.command)}")
+  options = dict(a[1:].split(":", 1) for a in args.command[3:] if a.startswith("/") and ":" in a)
+  time.sleep(args.delay)
+  if random.random() < args.fail_rate:
+    sys.exit("simulated mtc failure")
+  export(args.source, args.command[2], options.get("fd"), options.get("td"))
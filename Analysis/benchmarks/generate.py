@@ -0,0 +1,160 @@
+"""Synthetic ManicTime data for benchmarks and trying the pipeline without ManicTime.
+
+Writes <root>/data/applications.csv (same columns and formats as the mtc
+export), plus a process_tags.csv that covers every generated process and
+Obsidian note - so tagging never prompts - and a small tag_rules.json.
+
+  python generate.py <root> --rows 1000000 --years 3 --processes 40
+"""
+import os
+import sys
+import json
+import argparse
+import datetime as DT
+import numpy as np
+import pandas as pd
+
+SITES = ["YouTube", "Reddit", "Twitch", "ChatGPT", "Unity Manual", "python docs", "TensorFlow guide",
+         "TU Berlin", "News", "Mail", "Stack Overflow", "GitHub"]
+WORKSPACES = ["Passenger_Seo (Workspace)", "matar (Workspace)", "TimeManagement", "scratch"]
+FILES = ["main.py", "app.js", "README.md", "PlayerController.cs", "notes.txt", "time_management2.py"]
+NOTES = ["Ideas", "Plan", "Reading", "Recipes", "Projects", "Inbox"]
+GAMES = ["Overwatch", "Steam", "EpicGamesLauncher"]
+
+# (process, share of rows)
+MAIN_PROCESSES = [
+  ("Firefox Developer Edition", 0.30),
+  ("Visual Studio Code", 0.25),
+  ("Obsidian", 0.10),
+  ("Discord", 0.08),
+]
+
+
+def _processes(count):
+  """Process names with their row probabilities; count >= len(MAIN_PROCESSES) + len(GAMES)."""
+  names = [p for p, _ in MAIN_PROCESSES] + GAMES
+  weights = [w for _, w in MAIN_PROCESSES] + [0.04] * len(GAMES)
+  others = max(count - len(names), 1)
+  names += [f"Tool{k:03d}" for k in range(others)]
+  rest = 1.0 - sum(weights)
+  # long tail: a few tools get most of the remaining time
+  tail = 1.0 / np.arange(1, others + 1)
+  weights += list(rest * tail / tail.sum())
+  return np.array(names, dtype=object), np.array(weights)
+
+
+def _titles(process, days, rng):
+  """Window titles per row for the rows of one process."""
+  n = len(days)
+  if process == "Firefox Developer Edition":
+    return np.array([f"{s} - Mozilla Firefox" for s in SITES], dtype=object)[rng.integers(len(SITES), size=n)]
+  if process == "Visual Studio Code":
+    combos = np.array([f"{f} - {w} - Visual Studio Code" for w in WORKSPACES for f in FILES], dtype=object)
+    return combos[rng.integers(len(combos), size=n)]
+  if process == "Obsidian":
+    # a third of the time goes to the daily note of that day
+    notes = np.array([f"{note} - Vault - Obsidian v1.8.10" for note in NOTES], dtype=object)[rng.integers(len(NOTES), size=n)]
+    daily = rng.random(n) < 1 / 3
+    dates = pd.DatetimeIndex(days[daily]).strftime("%d.%m.%Y")
+    notes[daily] = [f"{d} - Vault - Obsidian v1.8.10" for d in dates]
+    return notes
+  return np.array([f"{process} - Window {k}" for k in range(8)], dtype=object)[rng.integers(8, size=n)]
+
+
+def generate_applications(rows, years=1.0, processes=40, end=None, seed=0, day_start_hour=8):
+  """A frame shaped like parse_applications_csv's output, rows sorted by Start."""
+  rng = np.random.default_rng(seed)
+  end = pd.Timestamp(end or DT.date.today())
+  days_total = max(int(round(365 * years)), 1)
+  first_day = end - pd.Timedelta(days=days_total - 1)
+  # spread rows over the days, some days busier than others
+  per_day = rng.gamma(4.0, 1.0, size=days_total)
+  counts = rng.multinomial(rows, per_day / per_day.sum())
+  day_index = np.repeat(np.arange(days_total), counts)
+  day = first_day + pd.to_timedelta(day_index, unit="D")
+
+  # each day: contiguous activity from day_start_hour for 8-18 hours, so
+  # late days run past midnight into the next calendar day
+  hours = np.repeat(rng.uniform(8, 18, size=len(counts)), counts)
+  duration = np.maximum(rng.exponential(1.0, size=rows), 0.05)
+  gap = rng.exponential(0.05, size=rows)
+  step = duration + gap
+  before = np.cumsum(step) - step
+  busy = counts[counts > 0]
+  first = (np.cumsum(counts) - counts)[counts > 0]
+  within = before - np.repeat(before[first], busy)
+  scale = hours * 3600 / np.repeat(np.add.reduceat(step, first), busy)
+  start_s = np.floor(within * scale)
+  dur_s = np.maximum(np.floor((within + duration) * scale) - start_s, 1)
+
+  start = day + pd.Timedelta(hours=day_start_hour) + pd.to_timedelta(start_s, unit="s")
+  duration_td = pd.to_timedelta(dur_s, unit="s")
+  names, weights = _processes(processes)
+  process = names[rng.choice(len(names), size=rows, p=weights / weights.sum())]
+
+  app = pd.DataFrame({"Name": np.empty(rows, dtype=object), "Start": start, "End": start + duration_td,
+                      "Duration": duration_td, "Process": process})
+  for p in np.unique(process):
+    mask = process == p
+    app.loc[mask, "Name"] = _titles(p, day[mask], rng)
+  return app.sort_values("Start", kind="stable").reset_index(drop=True)
+
+
+def process_tags_for(app):
+  """Tags for every process and non-date Obsidian note in app."""
+  rows = []
+  for p in sorted(app.Process.unique()):
+    if p in GAMES:
+      rows.append((p, "Game", "Games", "Game"))
+    elif p == "Discord":
+      rows.append((p, "Social", "Discord", "Social"))
+    elif p in ("Firefox Developer Edition", "Visual Studio Code"):
+      continue  # tagged by title in merge_tags
+    else:
+      rows.append((p, "Other", p, "Other"))
+  for note in NOTES:
+    rows.append((f"Obsidian-{note}", "Side", note, "Side Project"))
+  return pd.DataFrame(rows, columns=["Process", "Category", "Project", "Label"])
+
+
+TAG_RULES = [
+  {"pattern": "(?i)steam|epic|launcher", "category": "Game", "project": "Games", "label": "Game"},
+  {"pattern": "(?i)passenger_seo|matar", "category": "Main", "project": "Nathmis Portfolio", "label": "Main"},
+  {"pattern": "(?i)time ?management|time_management", "category": "Side", "project": "TimeManagement", "label": "Side Project"},
+]
+
+
+def _csv_times(values):
+  return np.datetime_as_string(values.to_numpy().astype("datetime64[s]"), unit="s").astype(object)
+
+
+def write_dataset(root_path, rows, years=1.0, processes=40, end=None, seed=0):
+  """Write applications.csv, process_tags.csv and tag_rules.json under root_path/data."""
+  data = os.path.join(root_path, "data")
+  os.makedirs(data, exist_ok=True)
+  app = generate_applications(rows, years, processes, end, seed)
+  seconds = app.Duration.dt.total_seconds().astype("int64").to_numpy()
+  out = pd.DataFrame({
+    "Name": app.Name,
+    "Start": np.char.replace(_csv_times(app.Start).astype(str), "T", " "),
+    "End": np.char.replace(_csv_times(app.End).astype(str), "T", " "),
+    "Duration": [f"{h}:{m:02d}:{s:02d}" for h, m, s in zip(seconds // 3600, seconds // 60 % 60, seconds % 60)],
+    "Process": app.Process})
+  out.to_csv(os.path.join(data, "applications.csv"), index=False)
+  process_tags_for(app).to_csv(os.path.join(data, "process_tags.csv"), index=False)
+  with open(os.path.join(data, "tag_rules.json"), "w", encoding="utf-8") as fh:
+    json.dump(TAG_RULES, fh, indent=2)
+  return app
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("root")
+  parser.add_argument("--rows", type=int, default=10_000)
+  parser.add_argument("--years", type=float, default=1.0)
+  parser.add_argument("--processes", type=int, default=40)
+  parser.add_argument("--end", default=None, help="last day (YYYY-MM-DD), default today")
+  parser.add_argument("--seed", type=int, default=0)
+  args = parser.parse_args()
+  write_dataset(args.root, args.rows, args.years, args.processes, args.end, args.seed)
+  print(f"Wrote {args.rows} rows to {os.path.join(args.root, 'data')}", file=sys.stderr)
@@ -0,0 +1,198 @@
+"""Optional SQLite backend for the tagged activity rows.
+
+data/activity.sqlite holds the processed rows (tagged, split at day
+boundaries) in an `activity` table indexed on effective_day, start and
+process, and a copy of process_tags.csv in `process_tags`. Reports then read
+only the days they show and let SQLite do the grouping for the cube, instead
+of loading the whole export and filtering it with boolean masks.
+
+Timestamps are stored as ISO text ("YYYY-MM-DD HH:MM:SS", days as
+"YYYY-MM-DD"), which sorts and compares correctly; durations as integer
+seconds.
+
+`coverage` lists every effective day whose rows were stored (days without
+activity included), so a read can tell stored-but-idle days from days that
+were never imported; `meta.history_start` is set by a whole-history import.
+"""
+import os
+import sqlite3
+import pandas as pd
+from aggregates import CUBE_KEYS, to_seconds
+
+DB_FILE = "activity.sqlite"
+COLUMNS = ["Name", "Start", "End", "Duration", "Process", "Category", "Project", "Label", "Tag", "Effective_Day"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS activity (
+  name TEXT, start TEXT NOT NULL, "end" TEXT NOT NULL, duration INTEGER NOT NULL,
+  process TEXT, category TEXT, project TEXT, label TEXT, tag TEXT,
+  effective_day TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS activity_day ON activity (effective_day, tag);
+CREATE INDEX IF NOT EXISTS activity_start ON activity (start);
+CREATE INDEX IF NOT EXISTS activity_process ON activity (process);
+CREATE TABLE IF NOT EXISTS process_tags (
+  process TEXT PRIMARY KEY, category TEXT, project TEXT, label TEXT
+);
+CREATE TABLE IF NOT EXISTS coverage (day TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+_TIME = "%Y-%m-%d %H:%M:%S"
+_DAY = "%Y-%m-%d"
+
+
+def _day(value):
+  return None if value is None else pd.Timestamp(value).strftime(_DAY)
+
+
+class ActivityDB:
+
+  def __init__(self, root_path):
+    self.path = os.path.join(root_path, "data", DB_FILE)
+    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+    self.con = sqlite3.connect(self.path)
+    self.con.executescript(SCHEMA)
+
+  def close(self):
+    self.con.close()
+
+  def _range(self, start, end, column="effective_day"):
+    """WHERE clause and params for start <= column <= end (either may be None)."""
+    clauses, params = [], []
+    if start is not None:
+      clauses.append(f"{column} >= ?")
+      params.append(_day(start))
+    if end is not None:
+      clauses.append(f"{column} <= ?")
+      params.append(_day(end))
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+  # Writing
+  # ------------------------------------------------------------------
+  def replace_days(self, app, start=None, end=None):
+    """Store app's rows, replacing the stored effective days start..end.
+
+    start/end default to the days app covers; start=None marks app as the
+    whole history. Rows outside start..end are
+    not stored: an export of [fd, td] holds only part of the effective day
+    before fd, which must not replace the stored complete one.
+    """
+    days = app["Effective_Day"]
+    keep = pd.Series(True, index=app.index)
+    if start is not None:
+      keep &= days >= pd.Timestamp(start)
+    if end is not None:
+      keep &= days <= pd.Timestamp(end)
+    app, days = app[keep], days[keep]
+    if app.empty and (start is None or end is None):
+      return 0
+    whole_history = start is None
+    start = days.min() if start is None else start
+    end = days.max() if end is None else end
+    rows = pd.DataFrame({
+      "name": app["Name"].astype(object),
+      "start": app["Start"].dt.strftime(_TIME),
+      "end": app["End"].dt.strftime(_TIME),
+      "duration": to_seconds(app["Duration"]),
+      "process": app["Process"].astype(object),
+      "category": app.get("Category"),
+      "project": app.get("Project"),
+      "label": app.get("Label"),
+      "tag": app["Tag"].astype(object),
+      "effective_day": days.dt.strftime(_DAY)})
+    # today (still running) and later days stay uncovered: they can get more rows
+    done = min(pd.Timestamp(end), pd.Timestamp.today().normalize() - pd.Timedelta(days=1))
+    covered = [(d,) for d in pd.date_range(start, done).strftime(_DAY)]
+    with self.con:
+      self.con.execute("DELETE FROM activity WHERE effective_day BETWEEN ? AND ?", (_day(start), _day(end)))
+      self.con.executemany(
+        'INSERT INTO activity (name, start, "end", duration, process, category, project, label, tag, effective_day) '
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        rows.astype(object).where(rows.notna(), None).itertuples(index=False, name=None))
+      self.con.executemany("INSERT OR IGNORE INTO coverage VALUES (?)", covered)
+      if whole_history:
+        self.con.execute("INSERT OR REPLACE INTO meta VALUES ('history_start', ?)", (_day(start),))
+    return len(rows)
+
+  def put_process_tags(self, process_tags):
+    rows = process_tags[["Process", "Category", "Project", "Label"]].astype(object)
+    with self.con:
+      self.con.execute("DELETE FROM process_tags")
+      self.con.executemany("INSERT OR REPLACE INTO process_tags VALUES (?, ?, ?, ?)",
+                           rows.where(rows.notna(), None).itertuples(index=False, name=None))
+
+  # Reading
+  # ------------------------------------------------------------------
+  def is_empty(self):
+    return self.con.execute("SELECT 1 FROM activity LIMIT 1").fetchone() is None
+
+  def days(self):
+    """(first, last) effective day stored, or (None, None)."""
+    first, last = self.con.execute("SELECT MIN(effective_day), MAX(effective_day) FROM activity").fetchone()
+    return (pd.Timestamp(first) if first else None, pd.Timestamp(last) if last else None)
+
+  def missing(self, start, end):
+    """(first, last) stored-range gap within start..end, or None if all days are stored.
+
+    start=None asks for the whole history: without a whole-history import
+    the answer is (None, end).
+    """
+    if start is None:
+      row = self.con.execute("SELECT value FROM meta WHERE key = 'history_start'").fetchone()
+      if row is None:
+        return None, pd.Timestamp(end)
+      start = row[0]
+    wanted = pd.date_range(pd.Timestamp(start), pd.Timestamp(end))
+    stored = {d for (d,) in self.con.execute("SELECT day FROM coverage WHERE day BETWEEN ? AND ?",
+                                             (_day(start), _day(end)))}
+    gaps = [d for d in wanted if d.strftime(_DAY) not in stored]
+    return (gaps[0], gaps[-1]) if gaps else None
+
+  def get_meta(self, key):
+    row = self.con.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+  def set_meta(self, key, value):
+    with self.con:
+      self.con.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+
+  def processes(self):
+    """Distinct processes of the stored rows."""
+    return [p for (p,) in self.con.execute("SELECT DISTINCT process FROM activity WHERE process IS NOT NULL")]
+
+  def activity(self, start=None, end=None):
+    """Rows with start <= Effective_Day <= end, in the layout of the import pipeline."""
+    where, params = self._range(start, end)
+    app = pd.read_sql_query(
+      'SELECT name, start, "end", duration, process, category, project, label, tag, effective_day '
+      f"FROM activity{where} ORDER BY start", self.con, params=params)
+    app.columns = COLUMNS
+    app["Start"] = pd.to_datetime(app["Start"], format=_TIME)
+    app["End"] = pd.to_datetime(app["End"], format=_TIME)
+    app["Duration"] = pd.to_timedelta(app["Duration"], unit="s")
+    app["Effective_Day"] = pd.to_datetime(app["Effective_Day"], format=_DAY)
+    return app
+
+  def cube(self, start=None, end=None):
+    """aggregates.build_cube computed by SQLite for start <= Effective_Day <= end."""
+    where, params = self._range(start, end)
+    keys = ", ".join(k.lower() for k in CUBE_KEYS)
+    cube = pd.read_sql_query(
+      f"SELECT {keys}, SUM(duration) AS seconds FROM activity{where} "
+      f"GROUP BY {keys} ORDER BY {keys}", self.con, params=params)
+    cube.columns = CUBE_KEYS + ["Seconds"]
+    cube["Effective_Day"] = pd.to_datetime(cube["Effective_Day"], format=_DAY)
+    cube["Seconds"] = cube["Seconds"].astype("int64")
+    return cube
+
+  def day_tag_seconds(self, start=None, end=None):
+    """Seconds per (Effective_Day, Tag); rows without a tag are left out."""
+    where, params = self._range(start, end)
+    where = (where + " AND" if where else " WHERE") + " tag IS NOT NULL"
+    out = pd.read_sql_query(
+      f"SELECT effective_day, tag, SUM(duration) AS seconds FROM activity{where} "
+      "GROUP BY effective_day, tag", self.con, params=params)
+    out["effective_day"] = pd.to_datetime(out["effective_day"], format=_DAY)
+    out = out.rename(columns={"effective_day": "Effective_Day", "tag": "Tag"})
+    return out.set_index(["Effective_Day", "Tag"])["seconds"].astype("int64")
@@ -0,0 +1,134 @@
+"""Pre-aggregated views of the tagged activity frame shared by all charts.
+
+The cube holds total seconds per Effective_Day x Category x Project x Tag x
+Process. It is built once per import; pie and bar charts slice it instead of
+grouping the raw rows again for every panel, so report cost no longer depends
+on the raw row count.
+"""
+import numpy as np
+import pandas as pd
+
+CUBE_KEYS = ["Effective_Day", "Category", "Project", "Tag", "Process"]
+
+
+def to_seconds(duration):
+  """Integer seconds of a timedelta (or already numeric) Series."""
+  if pd.api.types.is_timedelta64_dtype(duration):
+    duration = duration.dt.total_seconds()
+  return duration.round().astype("int64")
+
+
+def build_cube(app):
+  """Sum of seconds per CUBE_KEYS, sorted by Effective_Day."""
+  keys = [k for k in CUBE_KEYS if k in app.columns]
+  cube = (app.groupby(keys, dropna=False, observed=True, sort=True)["Duration"].sum()
+          .reset_index())
+  cube["Seconds"] = to_seconds(cube.pop("Duration"))
+  for k in keys:
+    # the cube is small; plain keys keep later groupbys free of unobserved categories
+    if isinstance(cube[k].dtype, pd.CategoricalDtype):
+      cube[k] = cube[k].astype(cube[k].cat.categories.dtype)
+  return cube.reset_index(drop=True)
+
+
+def day_tag_seconds(app):
+  """Seconds per (Effective_Day, Tag); rows without a tag are dropped."""
+  return to_seconds(app.groupby(["Effective_Day", "Tag"], observed=True)["Duration"].sum())
+
+
+def fold(total, part):
+  """Add an aggregate Series into a running total (None to start)."""
+  if total is None:
+    return part
+  return total.add(part, fill_value=0).astype("int64")
+
+
+def slice_days(cube, start=None, end=None):
+  """Cube rows with start <= Effective_Day <= end (cube is sorted by day)."""
+  days = cube["Effective_Day"].to_numpy()
+  lo = 0 if start is None else np.searchsorted(days, np.datetime64(pd.Timestamp(start)), side="left")
+  hi = len(days) if end is None else np.searchsorted(days, np.datetime64(pd.Timestamp(end)), side="right")
+  return cube.iloc[lo:hi]
+
+
+def tag_hours(cube, day):
+  """Hours per Tag on one effective day, sorted by tag."""
+  day_cube = slice_days(cube, day, day)
+  return day_cube.groupby("Tag")["Seconds"].sum().sort_index() / 3600
+
+
+def day_tag_hours(cube, start=None, end=None):
+  """Effective_Day x Tag table of hours for start <= day <= end."""
+  part = slice_days(cube, start, end)
+  table = part.groupby(["Effective_Day", "Tag"])["Seconds"].sum().unstack("Tag")
+  return table / 3600
+
+
+class Timeline:
+  """Cumulative hours per tag over the effective day, for many days at once.
+
+  All rows are sorted once by (day, tag, End) and a grouped cumsum gives the
+  running total per (day, tag); each tag additionally gets a zero point at
+  its first Start so its line starts on the x axis. day() then only slices
+  and pivots that day's points into the step series line_chart plots.
+  """
+
+  def __init__(self, app, days=None):
+    rows = app.loc[app["Tag"].notna(), ["Effective_Day", "Tag", "Start", "End", "Duration"]]
+    if days is not None:
+      rows = rows[rows["Effective_Day"].isin(pd.to_datetime(list(days)))]
+    points = pd.DataFrame({
+      "Effective_Day": rows["Effective_Day"].to_numpy(),
+      "Tag": rows["Tag"].to_numpy(),
+      "End": rows["End"].to_numpy(),
+      "Seconds": to_seconds(rows["Duration"]).to_numpy()})
+    anchors = rows.groupby(["Effective_Day", "Tag"], observed=True)["Start"].min().rename("End").reset_index()
+    anchors["Seconds"] = 0
+    points = pd.concat([points, anchors], ignore_index=True)
+    points = points.groupby(["Effective_Day", "Tag", "End"], observed=True, sort=True)["Seconds"].sum()
+    hours = points.groupby(level=["Effective_Day", "Tag"], observed=True).cumsum() / 3600
+    self.hours = hours.rename("Hours")
+    self._days = self.hours.index.get_level_values("Effective_Day")
+    # latest running total per (day, tag), where extend() continues
+    self._last = self.hours.groupby(level=["Effective_Day", "Tag"], observed=True).last()
+
+  def extend(self, app):
+    """Add rows ending after the ones already in (e.g. a live tick's new rows).
+
+    Their points continue the running totals of their (day, tag); only the
+    new rows are grouped.
+    """
+    new = Timeline(app).hours
+    if new.empty:
+      return
+    pairs = new.index.droplevel("End")
+    new = new + self._last.reindex(pairs).fillna(0).to_numpy()
+    last = new.groupby(level=["Effective_Day", "Tag"], observed=True).last()
+    self._last = pd.concat([self._last.drop(last.index, errors="ignore"), last])
+    self.hours = pd.concat([self.hours, new]).sort_index(kind="stable")
+    self._days = self.hours.index.get_level_values("Effective_Day")
+
+  def days(self):
+    return self._days.unique()
+
+  def day(self, day):
+    """End x Tag frame of cumulative hours (forward filled) for one day."""
+    day = pd.Timestamp(day)
+    lo, hi = self._days.searchsorted(day, side="left"), self._days.searchsorted(day, side="right")
+    part = self.hours.iloc[lo:hi].droplevel("Effective_Day")
+    if part.empty:
+      return pd.DataFrame()
+    return part.unstack("Tag").sort_index().ffill()
+
+  def series(self, day):
+    """{tag: (End times, cumulative hours)} of one day, without a shared x axis."""
+    day = pd.Timestamp(day)
+    lo, hi = self._days.searchsorted(day, side="left"), self._days.searchsorted(day, side="right")
+    part = self.hours.iloc[lo:hi].droplevel("Effective_Day")
+    return {tag: (s.index.get_level_values("End").to_numpy(), s.to_numpy())
+            for tag, s in part.groupby(level="Tag", observed=True, sort=False)}
+
+  def arrays(self, day):
+    """(End times, {tag: cumulative hours}) numpy arrays for one day."""
+    pivot = self.day(day)
+    return pivot.index.to_numpy(), {tag: pivot[tag].to_numpy() for tag in pivot.columns}
@@ -0,0 +1,175 @@
+"""Typed columnar cache for the ManicTime applications export.
+
+Parsing applications.csv (read_csv + to_datetime/to_timedelta) dominates the
+load time on long histories. The first load writes a parsed copy next to the
+CSV (datetimes already parsed, durations as integer seconds) and later loads
+read that copy for as long as the CSV is unchanged.
+"""
+import io
+import os
+import json
+import hashlib
+import pandas as pd
+
+CACHE_VERSION = 1
+CACHE_DIR = ".cache"
+
+
+def _parse_times(app):
+  app.Start = pd.to_datetime(app.Start)
+  app.End = pd.to_datetime(app.End)
+  app.Duration = pd.to_timedelta(app.Duration)
+  return app
+
+
+def parse_applications_csv(csv_path):
+  """Read a ManicTime applications export and parse its time columns."""
+  return _parse_times(pd.read_csv(csv_path, delimiter=","))
+
+
+def iter_applications_csv(csv_path, chunksize=100_000):
+  """Parsed frames of at most chunksize rows each, in file order."""
+  with pd.read_csv(csv_path, delimiter=",", chunksize=chunksize) as reader:
+    for chunk in reader:
+      yield _parse_times(chunk)
+
+
+class AppendReader:
+  """Re-read an export, parsing only what was appended since the last read.
+
+  The export is sorted by Start and only grows at the end, except that the
+  last row (the activity still running) gets a later End. The reader keeps
+  the offset where the last line starts and a hash of everything before it:
+  while that prefix is unchanged only the bytes from the offset on are
+  parsed, so the previous last row comes back (possibly extended) together
+  with the new ones. Otherwise the whole file is parsed again.
+  """
+
+  def __init__(self, csv_path):
+    self.path = csv_path
+    self.offset = 0
+    self.digest = None
+    self.header = b""
+
+  def read(self):
+    """Return (rows, full): full is False if rows only cover the tail."""
+    with open(self.path, "rb") as fh:
+      data = fh.read()
+    full = not (self.offset and len(data) >= self.offset
+                and hashlib.sha1(data[:self.offset]).hexdigest() == self.digest)
+    if full:
+      self.header = data[:data.find(b"\n") + 1]
+      start = len(self.header)
+    else:
+      start = self.offset
+    end = data.rfind(b"\n") + 1  # complete lines only
+    body = data[start:end] if end > start else b""
+    # next time, start again at the last complete line
+    last = data.rfind(b"\n", 0, max(end - 1, 0)) + 1
+    self.offset = max(last, len(self.header))
+    self.digest = hashlib.sha1(data[:self.offset]).hexdigest()
+    return parse_applications_csv(io.BytesIO(self.header + body)), full
+
+
+def file_digest(path, chunk_size=1 << 20):
+  h = hashlib.sha1()
+  with open(path, "rb") as fh:
+    for chunk in iter(lambda: fh.read(chunk_size), b""):
+      h.update(chunk)
+  return h.hexdigest()
+
+
+def cache_paths(csv_path):
+  """Return (data_path, meta_path) of the cache belonging to csv_path."""
+  folder = os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIR)
+  stem = os.path.splitext(os.path.basename(csv_path))[0]
+  return os.path.join(folder, stem + ".parquet"), os.path.join(folder, stem + ".meta.json")
+
+
+def _read_meta(meta_path):
+  try:
+    with open(meta_path, "r", encoding="utf-8") as fh:
+      return json.load(fh)
+  except (OSError, ValueError):
+    return None
+
+
+def _write_meta(meta_path, meta):
+  tmp = meta_path + ".tmp"
+  with open(tmp, "w", encoding="utf-8") as fh:
+    json.dump(meta, fh)
+  os.replace(tmp, meta_path)
+
+
+def _source_stamp(csv_path):
+  st = os.stat(csv_path)
+  return {"version": CACHE_VERSION, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def is_fresh(csv_path, meta):
+  """True if the cache described by meta still matches csv_path.
+
+  Size and mtime are checked first; only if the mtime moved (e.g. the file was
+  re-exported with identical content) the content hash decides.
+  """
+  if not meta or meta.get("version") != CACHE_VERSION:
+    return False
+  stamp = _source_stamp(csv_path)
+  if meta.get("size") != stamp["size"]:
+    return False
+  if meta.get("mtime_ns") == stamp["mtime_ns"]:
+    return True
+  return meta.get("sha1") == file_digest(csv_path)
+
+
+def to_columnar(app):
+  """Convert a parsed frame to the on-disk layout (Duration as int seconds)."""
+  out = app.copy()
+  out["Duration"] = out["Duration"].dt.total_seconds().round().astype("int64")
+  return out
+
+
+def from_columnar(app):
+  app["Duration"] = pd.to_timedelta(app["Duration"], unit="s")
+  return app
+
+
+def build_cache(csv_path):
+  """Parse csv_path and (re)write its columnar cache. Returns the parsed frame."""
+  app = parse_applications_csv(csv_path)
+  data_path, meta_path = cache_paths(csv_path)
+  os.makedirs(os.path.dirname(data_path), exist_ok=True)
+  meta = _source_stamp(csv_path)
+  meta["sha1"] = file_digest(csv_path)
+  tmp = data_path + ".tmp"
+  try:
+    to_columnar(app).to_parquet(tmp, index=False)
+  except ImportError:
+    # no parquet engine installed: keep working uncached
+    return app
+  os.replace(tmp, data_path)
+  _write_meta(meta_path, meta)
+  return app
+
+
+def load_applications(csv_path, use_cache=True):
+  """Load applications.csv, going through the columnar cache when possible.
+
+  Falls back to plain CSV parsing if no parquet engine (pyarrow/fastparquet)
+  is installed.
+  """
+  if not use_cache:
+    return parse_applications_csv(csv_path)
+  data_path, meta_path = cache_paths(csv_path)
+  meta = _read_meta(meta_path)
+  if os.path.exists(data_path) and is_fresh(csv_path, meta):
+    try:
+      app = from_columnar(pd.read_parquet(data_path))
+    except ImportError:
+      return parse_applications_csv(csv_path)
+    if meta.get("mtime_ns") != os.stat(csv_path).st_mtime_ns:
+      # content unchanged, only touched: remember the new mtime
+      meta.update(_source_stamp(csv_path))
+      _write_meta(meta_path, meta)
+    return app
+  return build_cache(csv_path)
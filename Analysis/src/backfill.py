@@ -0,0 +1,104 @@
+"""Parallel export of a long date range through the mtc CLI.
+
+One `mtc export` over years of history is slow and all-or-nothing. For a
+backfill the range is cut into windows of a few days, each exported by its
+own mtc process; a bounded pool keeps a few running at a time and a failed
+window is retried on its own. run() hands back the window CSVs in date
+order as soon as the windows before them are done, so they can be appended
+to the history store (which needs ascending appends) while later windows are
+still exporting.
+
+export_async runs a single export as an asyncio subprocess with a timeout,
+so the caller can process cached data while ManicTime is still exporting.
+
+The mtc command is configurable: a path, or a list of arguments (e.g.
+[sys.executable, "benchmarks/fake_mtc.py", "--source", csv]) for a stand-in.
+"""
+import os
+import time
+import asyncio
+import subprocess
+import datetime as DT
+from concurrent.futures import ThreadPoolExecutor
+
+MTC_PATH = "/Program Files/ManicTime/mtc"
+
+
+def mtc_command(mtc, out_path, fd=None, td=None):
+  """Argument list of `mtc export ManicTime/Applications out_path [/fd:..] [/td:..]`."""
+  cmd = [mtc] if isinstance(mtc, str) else list(mtc)
+  cmd += ["export", "ManicTime/Applications", out_path]
+  if fd is not None:
+    cmd.append("/fd:" + str(fd))
+  if td is not None:
+    cmd.append("/td:" + str(td))
+  return cmd
+
+
+async def export_async(mtc, out_path, fd=None, td=None, timeout=None):
+  """Run one mtc export; raises TimeoutError (after killing it) or RuntimeError on failure."""
+  proc = await asyncio.create_subprocess_exec(*mtc_command(mtc, out_path, fd, td),
+                                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+  try:
+    _, err = await asyncio.wait_for(proc.communicate(), timeout)
+  except asyncio.TimeoutError:
+    proc.kill()
+    await proc.wait()
+    raise TimeoutError(f"mtc export did not finish within {timeout}s")
+  if proc.returncode != 0 or not os.path.exists(out_path):
+    raise RuntimeError(f"mtc export failed with exit code {proc.returncode}: {err.decode(errors='replace').strip()[-200:]}")
+  return out_path
+
+
+def windows(fd, td, days=7):
+  """[(first, last), ...] covering the dates fd..td in windows of `days` days."""
+  out = []
+  start = fd
+  while start <= td:
+    end = min(start + DT.timedelta(days=days - 1), td)
+    out.append((start, end))
+    start = end + DT.timedelta(days=1)
+  return out
+
+
+class ParallelExport:
+
+  def __init__(self, mtc, out_dir, workers=4, retries=2, timeout=None, backoff=1.0):
+    self.mtc = mtc
+    self.out_dir = out_dir
+    self.workers = workers
+    self.retries = retries
+    self.timeout = timeout
+    self.backoff = backoff
+
+  def _export(self, window):
+    """Export one window, retrying failures; returns the CSV path."""
+    fd, td = window
+    path = os.path.join(self.out_dir, f"applications-{fd}-{td}.csv")
+    error = None
+    for attempt in range(self.retries + 1):
+      if attempt:
+        time.sleep(self.backoff * 2 ** (attempt - 1))
+      if os.path.exists(path):
+        os.remove(path)
+      try:
+        done = subprocess.run(mtc_command(self.mtc, path, fd, td), capture_output=True,
+                              text=True, timeout=self.timeout)
+      except (OSError, subprocess.TimeoutExpired) as exc:
+        error = str(exc)
+        continue
+      if done.returncode == 0 and os.path.exists(path):
+        return path
+      error = f"exit code {done.returncode}: {(done.stderr or done.stdout).strip()[-200:]}"
+    raise RuntimeError(f"mtc export {fd}..{td} failed after {self.retries + 1} attempts ({error})")
+
+  def run(self, windows):
+    """Yield (window, csv path) in window order; raises on a window that keeps failing."""
+    os.makedirs(self.out_dir, exist_ok=True)
+    pool = ThreadPoolExecutor(max_workers=self.workers)
+    try:
+      futures = [pool.submit(self._export, w) for w in windows]
+      for window, future in zip(windows, futures):
+        yield window, future.result()
+    finally:
+      pool.shutdown(wait=True, cancel_futures=True)
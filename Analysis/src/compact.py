@@ -0,0 +1,55 @@
+"""Compact in-memory layout of the tagged activity frame.
+
+Straight out of read_csv every text column is a Python string per row and
+the window titles (Name) alone dominate the frame's memory. compact_text
+stores the text columns as categoricals (titles repeat a lot, so Name is
+dictionary encoded the same way); it runs right after loading, before the
+frame is tagged and split, so the loose strings never coexist with a compact
+copy. compact_frame also stores Duration as int32 seconds once the effective
+days are split. Both convert the frame in place. Everything downstream reads
+Duration through aggregates.to_seconds, which accepts both layouts.
+"""
+import pandas as pd
+
+TEXT_COLUMNS = ["Name", "Process", "Category", "Project", "Label", "Tag", "Document", "App_Suffix", "Site"]
+TIME_COLUMNS = ["Start", "End", "Effective_Day"]
+
+
+def compact_text(app):
+  """Store app's text columns as categoricals, in place; returns app."""
+  for c in TEXT_COLUMNS:
+    if c in app.columns and not isinstance(app[c].dtype, pd.CategoricalDtype):
+      app[c] = app[c].astype("category")
+  return app
+
+
+def compact_frame(app):
+  """compact_text plus int32 Duration seconds, in place; returns app."""
+  compact_text(app)
+  if "Duration" in app.columns and pd.api.types.is_timedelta64_dtype(app["Duration"]):
+    app["Duration"] = app["Duration"].dt.total_seconds().round().astype("int32")
+  return app
+
+
+def loose_frame(app):
+  """The layout load_files produces: plain strings, ns timestamps, timedeltas."""
+  app = app.copy()
+  for c in TEXT_COLUMNS:
+    if c in app.columns and isinstance(app[c].dtype, pd.CategoricalDtype):
+      app[c] = app[c].astype(app[c].cat.categories.dtype)
+  for c in TIME_COLUMNS:
+    if c in app.columns:
+      app[c] = app[c].astype("datetime64[ns]")
+  if "Duration" in app.columns and pd.api.types.is_integer_dtype(app["Duration"]):
+    app["Duration"] = pd.to_timedelta(app["Duration"].astype("int64"), unit="s")
+  return app
+
+
+def memory_report(app):
+  """Bytes per column in the loose and the compact layout, with a total row."""
+  before = loose_frame(app).memory_usage(deep=True, index=False)
+  after = compact_frame(app.copy()).memory_usage(deep=True, index=False)
+  report = pd.DataFrame({"before": before, "after": after})
+  report.loc["total"] = report.sum()
+  report["ratio"] = (report["after"] / report["before"]).round(3)
+  return report
@@ -5,13 +5,15 @@ from os.path import exists
 from os import system
 import pandas as pd
 import datetime as DT
+from app_cache import load_applications
 
 
 class Dataset():
 
-    def __init__(self, root_path, export=True):
+    def __init__(self, root_path, export=True, use_cache=True):
         self.root_path = root_path
         self.export = export
+        self.use_cache = use_cache
         return
 
     def import_and_preprocess(self, fd=None, td=None):
@@ -36,11 +38,8 @@ class Dataset():
 
     def load_files(self):
         app_path = os.path.join(self.root_path, "data", "applications.csv")
-        app = pd.read_csv(app_path, delimiter=",")
-        
-        app.Start = pd.to_datetime(app.Start)
-        app.End = pd.to_datetime(app.End)
-        app.Duration = pd.to_timedelta(app.Duration)
+        # parsed columnar copy of the CSV, rebuilt only when the export changes
+        app = load_applications(app_path, self.use_cache)
 
         process_tags_path = os.path.join(self.root_path, "data", "process_tags.csv")
         if exists(process_tags_path):
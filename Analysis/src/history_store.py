@@ -0,0 +1,183 @@
+"""Append-only history store for incremental ManicTime ingest.
+
+Instead of re-exporting the full range into applications.csv on every run,
+only the rows newer than a persisted watermark (the latest stored End) are
+exported and appended as an immutable part file under data/history/.
+
+Layout:
+  data/history/part-000001.parquet   columnar rows (see app_cache.to_columnar)
+  data/history/watermark.json        {"end": <latest End>, "parts": [...], "seq": n}
+
+watermark.json is the commit point: part files it does not list (a run died
+between writing the part and the watermark) are ignored and removed on the
+next append.
+Requires a parquet engine (pyarrow or fastparquet).
+"""
+import os
+import json
+import glob
+import shutil
+import pandas as pd
+from app_cache import to_columnar, from_columnar
+
+HISTORY_DIR = "history"
+MAX_PARTS = 64
+
+
+def rows_after(app, end):
+  """Rows of app past end; rows still running at end are clipped to start there."""
+  if end is None or app.empty:
+    return app
+  app = app[app.End > end].copy()
+  running = app.Start < end
+  if running.any():
+    app.loc[running, "Start"] = end
+    app.loc[running, "Duration"] = app.loc[running, "End"] - end
+  return app
+
+
+class HistoryStore:
+
+  def __init__(self, root_path, name=HISTORY_DIR):
+    self.path = os.path.join(root_path, "data", name)
+    self.watermark_path = os.path.join(self.path, "watermark.json")
+
+  # State
+  # ------------------------------------------------------------------
+  def _read_state(self):
+    """The committed state; only a missing watermark.json is an empty store.
+
+    An unreadable one raises: taken as empty, the next append would reuse
+    part names and remove the committed parts as orphans.
+    """
+    try:
+      with open(self.watermark_path, "r", encoding="utf-8") as fh:
+        state = json.load(fh)
+    except FileNotFoundError:
+      return {"end": None, "parts": [], "seq": 0}
+    except (OSError, ValueError) as exc:
+      raise RuntimeError(f"cannot read {self.watermark_path} ({exc}); the history store is left untouched until it is fixed") from exc
+    if not isinstance(state, dict) or not isinstance(state.get("parts"), list) or "seq" not in state:
+      raise RuntimeError(f"{self.watermark_path} is not a history store state; the history store is left untouched until it is fixed")
+    return state
+
+  def _write_state(self, state):
+    os.makedirs(self.path, exist_ok=True)
+    tmp = self.watermark_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+      json.dump(state, fh)
+    os.replace(tmp, self.watermark_path)
+
+  def _new_part(self, state):
+    state["seq"] += 1
+    return f"part-{state['seq']:06d}.parquet"
+
+  def _remove_orphans(self, state):
+    committed = set(state["parts"])
+    for path in glob.glob(os.path.join(self.path, "part-*.parquet")):
+      if os.path.basename(path) not in committed:
+        os.remove(path)
+
+  def parts(self):
+    """Committed part files in append order."""
+    return [os.path.join(self.path, p) for p in self._read_state()["parts"]]
+
+  def watermark(self):
+    """Latest End stored, or None for an empty store."""
+    end = self._read_state().get("end")
+    return pd.Timestamp(end) if end else None
+
+  def is_empty(self):
+    return not self._read_state()["parts"]
+
+  # Writing
+  # ------------------------------------------------------------------
+  def new_rows(self, app, watermark=None):
+    """Drop the part of app that is already stored.
+
+    Exports are requested from the watermark's day, so they overlap the
+    store. Rows ending at or before the watermark are already stored; a row
+    that was still running at the last export is clipped to start at the
+    watermark so the stored totals stay exact.
+    """
+    watermark = self.watermark() if watermark is None else watermark
+    return rows_after(app, watermark)
+
+  def append(self, app):
+    """Append the unseen rows of app as a new part. Returns the rows added."""
+    state = self._read_state()
+    watermark = pd.Timestamp(state["end"]) if state.get("end") else None
+    app = self.new_rows(app, watermark)
+    if app.empty:
+      return app
+    os.makedirs(self.path, exist_ok=True)
+    self._remove_orphans(state)
+    app = app.sort_values("Start", kind="stable").reset_index(drop=True)
+    part = self._new_part(state)
+    to_columnar(app).to_parquet(os.path.join(self.path, part), index=False)
+    end = app.End.max() if watermark is None else max(watermark, app.End.max())
+    state["end"] = end.isoformat()
+    state["parts"].append(part)
+    self._write_state(state)
+    if len(state["parts"]) > MAX_PARTS:
+      self.compact()
+    return app
+
+  def replace_with(self, other):
+    """Make other's directory this store's (for a rebuilt history); other is emptied."""
+    old = self.path + ".old"
+    shutil.rmtree(old, ignore_errors=True)
+    if os.path.exists(self.path):
+      os.replace(self.path, old)
+    os.replace(other.path, self.path)
+    shutil.rmtree(old, ignore_errors=True)
+
+  def compact(self):
+    """Merge all committed parts into a single part."""
+    state = self._read_state()
+    if len(state["parts"]) <= 1:
+      return
+    old = self.parts()
+    merged = pd.concat([pd.read_parquet(p) for p in old], ignore_index=True)
+    part = self._new_part(state)
+    merged.to_parquet(os.path.join(self.path, part), index=False)
+    state["parts"] = [part]
+    self._write_state(state)
+    for path in old:
+      os.remove(path)
+
+  # Reading
+  # ------------------------------------------------------------------
+  def load(self, fd=None, td=None):
+    """Rows with Start in [fd, td] (dates, inclusive), or the full history."""
+    parts = self.parts()
+    if not parts:
+      return pd.DataFrame({
+        "Name": pd.Series(dtype=object),
+        "Start": pd.Series(dtype="datetime64[ns]"),
+        "End": pd.Series(dtype="datetime64[ns]"),
+        "Duration": pd.Series(dtype="timedelta64[ns]"),
+        "Process": pd.Series(dtype=object)})
+    filters = []
+    if fd is not None:
+      filters.append(("Start", ">=", pd.Timestamp(fd)))
+    if td is not None:
+      filters.append(("Start", "<", pd.Timestamp(td) + pd.Timedelta(days=1)))
+    frames = [pd.read_parquet(p, filters=filters or None) for p in parts]
+    app = pd.concat(frames, ignore_index=True)
+    return from_columnar(app)
+
+  def iter_chunks(self, chunksize=100_000):
+    """The full history as frames of at most chunksize rows, in append order."""
+    try:
+      import pyarrow.parquet as pq
+    except ImportError:
+      pq = None
+    for path in self.parts():
+      if pq is None:
+        part = pd.read_parquet(path)
+        for lo in range(0, len(part), chunksize):
+          yield from_columnar(part.iloc[lo:lo + chunksize].reset_index(drop=True))
+        continue
+      for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+        yield from_columnar(batch.to_pandas())
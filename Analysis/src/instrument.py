@@ -0,0 +1,151 @@
+"""Opt-in per-stage instrumentation of the pipeline.
+
+Enabled with TimeManagement(trace=True) or the TM_TRACE environment variable
+("1" for the default file, anything else is taken as the trace file path).
+Every traced stage appends one JSON line with wall time, CPU time, peak
+traced memory (tracemalloc) and row count to the trace file; at exit a
+summary table per stage is printed for every tracer still alive (one exit
+handler for all of them).
+
+Disabled tracers cost one attribute check per stage.
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import atexit
+import weakref
+import functools
+import tracemalloc
+import datetime as DT
+from contextlib import contextmanager
+
+ENV_VAR = "TM_TRACE"
+
+_tracers = weakref.WeakSet()  # enabled tracers, summarized at exit
+_atexit_registered = False
+
+
+def _print_summaries():
+  for tracer in list(_tracers):
+    tracer.print_summary()
+
+
+def _track(tracer):
+  global _atexit_registered
+  _tracers.add(tracer)
+  if not _atexit_registered:
+    atexit.register(_print_summaries)
+    _atexit_registered = True
+
+
+class Tracer:
+
+  def __init__(self, path=None, enabled=False):
+    self.path = path
+    self.enabled = enabled
+    self.run = uuid.uuid4().hex[:8]
+    self.records = []
+    self._stack = []
+    if enabled:
+      if not tracemalloc.is_tracing():
+        tracemalloc.start()
+      _track(self)
+
+  @classmethod
+  def from_env(cls, root_path, enabled=False):
+    """Tracer enabled by the flag or TM_TRACE, writing to data/trace.jsonl by default."""
+    env = os.environ.get(ENV_VAR, "")
+    path = os.path.join(root_path, "data", "trace.jsonl")
+    if env and env not in ("0", "1"):
+      path = env
+    return cls(path, enabled or env not in ("", "0"))
+
+  @contextmanager
+  def stage(self, name):
+    """Time the block; set record["rows"] inside it to report a row count."""
+    if not self.enabled:
+      yield {}
+      return
+    record = {"run": self.run, "stage": name, "depth": len(self._stack),
+              "start": DT.datetime.now().isoformat(timespec="milliseconds")}
+    # the peak is reset per stage; a parent's peak is the max over its children
+    record["_peak"] = 0
+    if self._stack:
+      parent = self._stack[-1]
+      parent["_peak"] = max(parent["_peak"], tracemalloc.get_traced_memory()[1])
+    base = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    self._stack.append(record)
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+      yield record
+    finally:
+      record["wall_s"] = round(time.perf_counter() - wall, 4)
+      record["cpu_s"] = round(time.process_time() - cpu, 4)
+      self._stack.pop()
+      peak = max(record.pop("_peak"), tracemalloc.get_traced_memory()[1])
+      record["peak_mb"] = round(max(peak - base, 0) / 2**20, 2)
+      if self._stack:
+        self._stack[-1]["_peak"] = max(self._stack[-1]["_peak"], peak)
+      self._write(record)
+
+  def _write(self, record):
+    self.records.append(record)
+    if not self.path:
+      return
+    os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+    with open(self.path, "a", encoding="utf-8") as fh:
+      fh.write(json.dumps(record) + "\n")
+
+  def summary(self):
+    """[(stage, calls, wall_s, cpu_s, peak_mb, rows)] in order of first appearance."""
+    table = {}
+    for r in self.records:
+      calls, wall, cpu, peak, rows = table.get(r["stage"], (0, 0.0, 0.0, 0.0, 0))
+      table[r["stage"]] = (calls + 1, wall + r["wall_s"], cpu + r["cpu_s"],
+                           max(peak, r["peak_mb"]), rows + (r.get("rows") or 0))
+    return [(stage,) + values for stage, values in table.items()]
+
+  def print_summary(self, file=None):
+    rows = self.summary()
+    if not rows:
+      return
+    file = file or sys.stderr
+    print(f"{'stage':<28}{'calls':>6}{'wall s':>10}{'cpu s':>10}{'peak MB':>10}{'rows':>12}", file=file)
+    for stage, calls, wall, cpu, peak, n in rows:
+      print(f"{stage:<28}{calls:>6}{wall:>10.3f}{cpu:>10.3f}{peak:>10.1f}{n:>12}", file=file)
+    if self.path:
+      print(f"trace: {self.path} (run {self.run})", file=file)
+
+
+def _row_count(args, out):
+  """Rows of the frame a stage works on: its first argument, else its result."""
+  for value in (args[0] if args else None, out[0] if isinstance(out, tuple) and out else out):
+    if hasattr(value, "columns"):
+      return len(value)
+  return None
+
+
+def traced(fn=None, name=None):
+  """Method decorator: trace the call as a stage of self.tracer.
+
+  Use as @traced or @traced(name="stage").
+  """
+  if fn is None:
+    return functools.partial(traced, name=name)
+
+  @functools.wraps(fn)
+  def wrapper(self, *args, **kwargs):
+    tracer = getattr(self, "tracer", None)
+    if tracer is None or not tracer.enabled:
+      return fn(self, *args, **kwargs)
+    with tracer.stage(name or fn.__name__) as record:
+      out = fn(self, *args, **kwargs)
+      rows = _row_count(args, out)
+      if rows is None and getattr(self, "app", None) is not None:
+        rows = len(self.app)
+      record["rows"] = rows
+      return out
+  return wrapper
@@ -0,0 +1,39 @@
+"""Date ranges of the reports, for loading once and rendering several reports.
+
+Each report reads a few effective days around its reference day td. The
+union of the requested reports' ranges is imported and preprocessed once;
+every report then picks its days out of the shared frame and cube.
+
+  summary      td-7 .. td   (line of td, pies of the last 3 days, week bars)
+  week         td-7 .. td
+  three_week   Monday two weeks before td's week .. td
+  month        first .. last day of `month` (in td's year)
+  all_time     nothing: it reads the rollups (see rollups.py)
+"""
+import datetime as DT
+import pandas as pd
+
+REPORTS = ("summary", "week", "three_week", "month", "all_time")
+
+
+def month_range(month, year):
+  fd = DT.date(year, month, 1)
+  return fd, (pd.Timestamp(fd) + pd.offsets.MonthEnd(0)).date()
+
+
+def report_range(report, td, month=None):
+  """(first, last) effective day report needs, None if it needs no import."""
+  if report in ("summary", "week"):
+    return td - DT.timedelta(days=7), td
+  if report == "three_week":
+    return td - DT.timedelta(days=td.weekday() + 14), td
+  if report == "month":
+    return month_range(month or td.month, td.year)
+  if report == "all_time":
+    return None
+  raise ValueError(f"unknown report {report!r}, expected one of {', '.join(REPORTS)}")
+
+
+def union_range(ranges):
+  """Smallest (first, last) covering all ranges."""
+  return min(fd for fd, _ in ranges), max(td for _, td in ranges)
@@ -0,0 +1,243 @@
+"""Parallel rendering of report panels.
+
+The multi-panel reports (three-week summary, month view) used to draw every
+pie and line chart serially into one pyplot figure. Here every panel is a
+small picklable spec holding only its pre-aggregated data (hours per tag for
+a pie, the cumulative timeline for a line chart). Worker processes draw each
+spec with the object-oriented Figure API on the Agg backend and return the
+bitmap; the main process pastes the bitmaps into the report image at the
+positions the report's GridSpec gives them.
+
+RenderCache keeps the bitmaps keyed by a hash of everything that determines
+them (kind, size, data, colors, title, style), so past days - whose data
+no longer changes - are reused and only panels with new data are redrawn.
+"""
+import os
+import glob
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import matplotlib
+import matplotlib.dates as mdates
+import matplotlib.patches as mpatches
+import matplotlib.image as mimage
+from matplotlib.figure import Figure
+from matplotlib.gridspec import GridSpec
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
+
+DPI = 100
+
+
+def panel_spec(kind, rect, data, colors, title=None, style=None, **options):
+  """A unit of work for render_panel.
+
+  rect is (x, y, w, h) in pixels from the top-left corner of the report;
+  data is what the drawing function needs: [(tag, hours), ...] for "pie",
+  (x, {tag: y}) for "line", (labels, {tag: values}) for "bar", ignored for
+  "legend".
+  """
+  return {"kind": kind, "rect": rect, "data": data, "colors": colors,
+          "title": title, "style": style or {}, "options": options}
+
+
+# Drawing (runs in the workers)
+# ------------------------------------------------------------------
+def _draw_pie(ax, data, colors, options):
+  tags = [tag for tag, _ in data]
+  hours = np.array([h for _, h in data], dtype=float)
+  total = hours.sum()
+  ax.pie(hours, colors=[colors.get(t, "black") for t in tags], startangle=90,
+         autopct=lambda pct: "{:.1f} h".format(pct / 100. * total))
+  ax.set_aspect("equal")
+
+
+def _draw_line(ax, data, colors, options):
+  x, series = data
+  for tag, y in series.items():
+    ax.plot(x, y, color=colors.get(tag), label=tag)
+  ax.grid(True)
+  ax.xaxis.set_major_formatter(mdates.DateFormatter('%H'))
+  ax.set_ylim(bottom=0)
+  if options.get("legend"):
+    ax.legend(loc='upper left')
+
+
+def _draw_bar(ax, data, colors, options):
+  labels, series = data
+  x = np.arange(len(labels))
+  width = 0.5 / max(len(series), 1)
+  for k, (tag, values) in enumerate(series.items()):
+    offset = (k - (len(series) - 1) / 2) * width
+    ax.bar(x + offset, np.nan_to_num(np.asarray(values, dtype=float)), width, color=colors.get(tag), label=tag)
+  ax.set_xticks(x, labels, rotation=45)
+  ax.grid(True)
+
+
+def _draw_legend(fig, colors):
+  handles = [mpatches.Patch(color=color, label=label) for label, color in colors.items()]
+  fig.legend(handles=handles, loc='center left', bbox_to_anchor=(0.0, 0.5))
+
+
+def render_panel(spec):
+  """Draw one panel spec and return its RGB bitmap (h, w, 3) uint8."""
+  x, y, w, h = spec["rect"]
+  with matplotlib.rc_context(spec["style"]):
+    fig = Figure(figsize=(w / DPI, h / DPI), dpi=DPI)
+    canvas = FigureCanvasAgg(fig)
+    if spec["kind"] == "legend":
+      _draw_legend(fig, spec["colors"])
+    else:
+      # leave the top of the panel for the title, like the subplot spacing did
+      top = 1.0 - spec["options"].get("title_px", 0) / h
+      if spec["kind"] == "pie":
+        ax = fig.add_axes([0.0, 0.0, 1.0, top])
+        _draw_pie(ax, spec["data"], spec["colors"], spec["options"])
+      else:
+        # room for the tick labels of line and bar charts
+        left, bottom = spec["options"].get("margins", (0.06, 0.12))
+        ax = fig.add_axes([left, bottom, 0.98 - left, top - bottom])
+        draw = _draw_line if spec["kind"] == "line" else _draw_bar
+        draw(ax, spec["data"], spec["colors"], spec["options"])
+      if spec["title"]:
+        ax.set_title(spec["title"])
+    canvas.draw()
+    return np.asarray(canvas.buffer_rgba())[..., :3].copy()
+
+
+# Orchestration (main process)
+# ------------------------------------------------------------------
+def _render_all(specs, workers):
+  workers = workers or os.cpu_count() or 1
+  if workers == 1 or len(specs) < 2:
+    return [render_panel(s) for s in specs]
+  with ProcessPoolExecutor(max_workers=min(workers, len(specs))) as pool:
+    return list(pool.map(render_panel, specs))
+
+
+def render_panels(specs, workers=None, cache=None):
+  """Render specs, in worker processes when workers != 1.
+
+  With a RenderCache only the specs without a cached bitmap are drawn.
+  """
+  if cache is None:
+    return _render_all(specs, workers)
+  keys = [cache.key(s) for s in specs]
+  images = [cache.get(k) for k in keys]
+  todo = [i for i, img in enumerate(images) if img is None]
+  for i, img in zip(todo, _render_all([specs[i] for i in todo], workers)):
+    images[i] = img
+    cache.put(keys[i], img)
+  return images
+
+
+class RenderCache:
+  """Content-addressed panel bitmaps under path, with hit/miss counters."""
+
+  VERSION = "1"
+
+  def __init__(self, path, max_entries=5000):
+    self.path = path
+    self.max_entries = max_entries
+    self.hits = 0
+    self.misses = 0
+
+  def key(self, spec):
+    h = hashlib.sha1()
+    h.update((self.VERSION + matplotlib.__version__).encode())
+    _feed(h, spec)
+    return h.hexdigest()
+
+  def _file(self, key):
+    return os.path.join(self.path, key[:2], key + ".png")
+
+  def get(self, key):
+    path = self._file(key)
+    try:
+      with Image.open(path) as img:
+        bitmap = np.asarray(img.convert("RGB"))
+    except (OSError, ValueError):
+      self.misses += 1
+      return None
+    os.utime(path)  # recently used, see prune()
+    self.hits += 1
+    return bitmap
+
+  def put(self, key, bitmap):
+    path = self._file(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    Image.fromarray(bitmap).save(tmp, format="PNG", compress_level=1)
+    os.replace(tmp, path)
+
+  def stats(self):
+    total = self.hits + self.misses
+    return {"hits": self.hits, "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0}
+
+  def prune(self):
+    """Drop the least recently used bitmaps beyond max_entries."""
+    files = glob.glob(os.path.join(self.path, "*", "*.png"))
+    if len(files) <= self.max_entries:
+      return
+    files.sort(key=os.path.getmtime)
+    for path in files[:len(files) - self.max_entries]:
+      os.remove(path)
+
+
+def _feed(h, obj):
+  """Hash obj structurally (dicts by sorted key, arrays by dtype/shape/bytes)."""
+  if isinstance(obj, dict):
+    h.update(b"{")
+    for k in sorted(obj, key=str):
+      _feed(h, k)
+      _feed(h, obj[k])
+    h.update(b"}")
+  elif isinstance(obj, (list, tuple)):
+    h.update(b"[")
+    for item in obj:
+      _feed(h, item)
+    h.update(b"]")
+  elif isinstance(obj, np.ndarray):
+    h.update(f"{obj.dtype}{obj.shape}".encode())
+    h.update(np.ascontiguousarray(obj).tobytes() if obj.dtype != object else repr(obj.tolist()).encode())
+  else:
+    h.update(repr(obj).encode())
+
+
+def grid_rects(size, rows, cols, **gridspec_kw):
+  """Pixel rects (x, y, w, h) per (row, col) cell of a GridSpec, plus a gap.
+
+  Returns (rect_of, title_px): rect_of(row_slice, col_slice) gives the rect
+  of a (possibly spanning) cell extended upwards by the vertical gap between
+  rows, which is where the subplot titles used to sit.
+  """
+  width, height = size
+  fig = Figure(figsize=(width / DPI, height / DPI), dpi=DPI)
+  gs = GridSpec(rows, cols, figure=fig, **gridspec_kw)
+  cell = gs[0, 0].get_position(fig)
+  below = gs[1, 0].get_position(fig) if rows > 1 else None
+  gap = (cell.y0 - below.y1) if below is not None else 0.05
+  title_px = int(round(gap * height))
+
+  def rect_of(r, c):
+    box = gs[r, c].get_position(fig)
+    x0, x1 = int(round(box.x0 * width)), int(round(box.x1 * width))
+    y0 = int(round((1 - box.y1) * height)) - title_px
+    y1 = int(round((1 - box.y0) * height))
+    return (x0, max(y0, 0), x1 - x0, y1 - max(y0, 0))
+
+  return rect_of, title_px
+
+
+def composite(size, specs, images, path):
+  """Paste rendered panels onto a white canvas and save it to path."""
+  width, height = size
+  canvas = np.full((height, width, 3), 255, dtype=np.uint8)
+  for spec, img in zip(specs, images):
+    x, y, _, _ = spec["rect"]
+    h = min(img.shape[0], height - y)
+    w = min(img.shape[1], width - x)
+    canvas[y:y + h, x:x + w] = img[:h, :w]
+  mimage.imsave(path, canvas)
+  return canvas
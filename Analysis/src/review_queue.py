@@ -0,0 +1,52 @@
+"""Persisted queue of processes that headless tagging could not tag.
+
+data/review_queue.json maps the process (or "Obsidian-<file>") to what a
+reviewer needs to decide quickly: a few sample titles, the hours affected in
+the last run that saw it and the best suggestion, if any. TimeManagement.review
+walks the queue by hours and applies the answers in one write.
+"""
+import os
+import json
+import datetime as DT
+
+QUEUE_FILE = "review_queue.json"
+SAMPLES = 3
+
+
+class ReviewQueue:
+
+  def __init__(self, root_path):
+    self.path = os.path.join(root_path, "data", QUEUE_FILE)
+    self.items = self._read()
+
+  def _read(self):
+    try:
+      with open(self.path, "r", encoding="utf-8") as fh:
+        return json.load(fh)
+    except (OSError, ValueError):
+      return {}
+
+  def save(self):
+    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+    tmp = self.path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+      json.dump(self.items, fh, indent=2)
+    os.replace(tmp, self.path)
+
+  def __len__(self):
+    return len(self.items)
+
+  def __contains__(self, key):
+    return key in self.items
+
+  def add(self, key, samples, hours, suggestion=None):
+    item = self.items.setdefault(key, {"first_seen": DT.date.today().isoformat()})
+    item.update({"samples": list(samples)[:SAMPLES], "hours": round(float(hours), 2),
+                 "suggestion": suggestion, "last_seen": DT.date.today().isoformat()})
+
+  def remove(self, key):
+    self.items.pop(key, None)
+
+  def by_hours(self):
+    """(key, item) pairs, most hours first."""
+    return sorted(self.items.items(), key=lambda kv: kv[1].get("hours", 0), reverse=True)
@@ -0,0 +1,174 @@
+"""Materialized daily / weekly rollups of tagged time for all-time trends.
+
+data/rollups/ holds small wide tables (one column per Tag):
+
+  daily.parquet        seconds per effective day, every calendar day (0 when idle)
+  cumulative.parquet   running sum of daily since the first day
+  weekly.parquet       seconds per W-MON week, as daily.resample("W-MON").sum()
+  mean_7.parquet ...   rolling mean hours per day over the last 7 / 30 days
+
+replace_days() rewrites only the days new data touched and recomputes the
+tables from the first touched day on: running sums continue from the stored
+sum of the day before, a rolling mean is (cum[t] - cum[t-w]) / w, and only
+the weeks from the touched one on are summed again. The all-time charts then
+read a few hundred rows instead of grouping the full history.
+
+meta.json records what the tables were tagged with (the processes seen and
+the signature of their process_tags.csv rows), so a tag edit can be told
+apart from new data and the tables rebuilt.
+"""
+import os
+import json
+import numpy as np
+import pandas as pd
+
+ROLLUP_DIR = "rollups"
+WINDOWS = (7, 30)
+
+
+def week_labels(days):
+  """W-MON label (the Monday closing the week) of each day."""
+  return days + pd.to_timedelta((0 - days.weekday) % 7, unit="D")
+
+
+class Rollups:
+
+  def __init__(self, root_path, windows=WINDOWS):
+    self.path = os.path.join(root_path, "data", ROLLUP_DIR)
+    self.windows = tuple(windows)
+    self._tables = None
+    self._meta = None
+
+  def _names(self):
+    return ["daily", "cumulative", "weekly"] + [f"mean_{w}" for w in self.windows]
+
+  def _file(self, name):
+    return os.path.join(self.path, f"{name}.parquet")
+
+  def tables(self):
+    """All tables by name, loaded once (empty frames for a new store)."""
+    if self._tables is None:
+      self._tables = {}
+      for name in self._names():
+        path = self._file(name)
+        self._tables[name] = pd.read_parquet(path) if os.path.exists(path) else pd.DataFrame(index=pd.DatetimeIndex([]))
+    return self._tables
+
+  def meta(self):
+    """Metadata stored with the tables ({} for a new store)."""
+    if self._meta is None:
+      try:
+        with open(os.path.join(self.path, "meta.json"), "r", encoding="utf-8") as fh:
+          self._meta = json.load(fh)
+      except (OSError, ValueError):
+        self._meta = {}
+    return self._meta
+
+  def _save(self):
+    os.makedirs(self.path, exist_ok=True)
+    for name, table in self._tables.items():
+      tmp = self._file(name) + ".tmp"
+      table.to_parquet(tmp)
+      os.replace(tmp, self._file(name))
+    self.save_meta()
+
+  def save_meta(self):
+    os.makedirs(self.path, exist_ok=True)
+    tmp = os.path.join(self.path, "meta.json.tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+      json.dump(self.meta(), fh)
+    os.replace(tmp, os.path.join(self.path, "meta.json"))
+
+  # Reading
+  # ------------------------------------------------------------------
+  def is_empty(self):
+    return self.tables()["daily"].empty
+
+  def days(self):
+    """(first, last) day covered, or (None, None)."""
+    daily = self.tables()["daily"]
+    return (daily.index[0], daily.index[-1]) if not daily.empty else (None, None)
+
+  def daily_hours(self):
+    return self.tables()["daily"] / 3600
+
+  def weekly_hours(self):
+    return self.tables()["weekly"] / 3600
+
+  def mean_hours(self, window):
+    """Rolling mean of hours per day over window days (one of self.windows)."""
+    return self.tables()[f"mean_{window}"]
+
+  # Writing
+  # ------------------------------------------------------------------
+  def replace_days(self, seconds, first=None, last=None, meta=None):
+    """Replace days first..last with seconds, a (Effective_Day, Tag) Series.
+
+    first=None rebuilds everything from seconds. Days in range without rows
+    count as 0. meta replaces the stored metadata. Returns False (and
+    changes nothing) if first lies after the day following the stored ones
+    (the tables would have a hole), or if the store is empty and first is
+    given.
+    """
+    tables = self.tables()
+    daily = tables["daily"]
+    part = seconds.unstack("Tag", fill_value=0) if not seconds.empty else pd.DataFrame()
+    if first is None:
+      if part.empty:
+        return False
+      for name in self._names():
+        tables[name] = tables[name].iloc[0:0]
+      daily = tables["daily"]
+      first = part.index.min()
+    elif daily.empty or pd.Timestamp(first) > daily.index[-1] + pd.Timedelta(days=1):
+      # only a full rebuild starts the tables; updates must join on to them
+      return False
+    first = pd.Timestamp(first)
+    last = pd.Timestamp(last) if last is not None else part.index.max()
+    part = part.reindex(pd.date_range(first, last), fill_value=0)
+    kept = daily[(daily.index < first) | (daily.index > last)]
+    daily = pd.concat([kept, part]).sort_index()
+    daily = daily.reindex(pd.date_range(daily.index[0], daily.index[-1]), columns=sorted(daily.columns))
+    daily = daily.fillna(0).astype("int64")
+    tables["daily"] = daily
+    self._update_from(first, daily)
+    if meta is not None:
+      self._meta = dict(meta)
+    self._save()
+    return True
+
+  def _update_from(self, first, daily):
+    """Recompute cumulative, rolling means and weekly for days >= first."""
+    tables = self.tables()
+    first = max(first, daily.index[0])
+    start = daily.index.get_loc(first)
+    before = tables["cumulative"].reindex(columns=daily.columns, fill_value=0)
+    before = before[before.index < first]
+    if start > 0 and len(before) == start:
+      base = before.iloc[-1]
+    else:
+      # no running sum for the day before first: start over from the first day
+      start, first, before = 0, daily.index[0], before.iloc[0:0]
+      base = pd.Series(0, index=daily.columns)
+    tail = daily.iloc[start:].cumsum() + base
+    cum = pd.concat([before, tail]).astype("int64")
+    tables["cumulative"] = cum
+
+    positions = np.arange(start, len(daily))
+    for w in self.windows:
+      lo = max(start - w, 0)
+      window_cum = cum.iloc[lo:]
+      lagged = window_cum.shift(w).iloc[start - lo:].fillna(0)
+      count = np.minimum(positions + 1, w)[:, None]
+      mean = (window_cum.iloc[start - lo:] - lagged) / count / 3600
+      old = tables[f"mean_{w}"].reindex(columns=daily.columns, fill_value=0.0)
+      tables[f"mean_{w}"] = pd.concat([old[old.index < first], mean])
+
+    labels = week_labels(daily.index)
+    first_week = labels[start]
+    touched = labels >= first_week
+    weeks = daily[touched].groupby(labels[touched]).sum()
+    old = tables["weekly"].reindex(columns=daily.columns, fill_value=0)
+    weekly = pd.concat([old[old.index < first_week], weeks]).astype("int64")
+    weekly.index.name = None
+    tables["weekly"] = weekly
@@ -0,0 +1,109 @@
+"""Per-month shards of the processed (tagged, split) activity rows.
+
+data/shards/2026-09.parquet holds every row whose Effective_Day falls in
+September 2026. A month is frozen once it is over: its shard is reused as
+is, only the current month is rebuilt (once per run). Any [fd, td] request
+reads the overlapping shards, so the month view and the three week report
+share the work instead of exporting and tagging overlapping ranges twice.
+
+shards.json records per month whether it is frozen and the signature of the
+tags it was tagged with: the process_tags.csv rows of the shard's processes
+(see tag_index.tag_signature). A shard whose processes were tagged
+differently since is re-tagged (not re-exported) when it is read; processes
+added for newer data leave it alone.
+"""
+import os
+import json
+import datetime as DT
+import pandas as pd
+from app_cache import to_columnar, from_columnar
+from tag_index import tag_signature
+
+SHARD_DIR = "shards"
+
+
+class MonthShards:
+
+  def __init__(self, root_path):
+    self.root_path = root_path
+    self.path = os.path.join(root_path, "data", SHARD_DIR)
+    self.meta_path = os.path.join(self.path, "shards.json")
+    self._loaded = {}  # month -> frame, shared by all reads of this run
+
+  # State
+  # ------------------------------------------------------------------
+  def _read_meta(self):
+    try:
+      with open(self.meta_path, "r", encoding="utf-8") as fh:
+        return json.load(fh)
+    except (OSError, ValueError):
+      return {}
+
+  def _write_meta(self, meta):
+    os.makedirs(self.path, exist_ok=True)
+    tmp = self.meta_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+      json.dump(meta, fh, indent=2)
+    os.replace(tmp, self.meta_path)
+
+  def tag_signature(self, processes):
+    """Signature of the current tags of processes."""
+    data = os.path.join(self.root_path, "data")
+    try:
+      process_tags = pd.read_csv(os.path.join(data, "process_tags.csv"))
+    except (OSError, pd.errors.EmptyDataError):
+      process_tags = pd.DataFrame(columns=["Process"])
+    return tag_signature(process_tags, processes, os.path.join(data, "tag_rules.json"))
+
+  def shard_path(self, month):
+    return os.path.join(self.path, f"{month}.parquet")
+
+  @staticmethod
+  def months(fd, td):
+    return list(pd.period_range(pd.Period(fd, "M"), pd.Period(td, "M"), freq="M"))
+
+  # Reading
+  # ------------------------------------------------------------------
+  def load(self, fd, td, build, retag, today=None):
+    """Rows with fd <= Effective_Day <= td.
+
+    build(month) returns the processed rows of a month, retag(frame) re-tags
+    processed rows; both are only called for months that need it.
+    """
+    today = pd.Timestamp(today or DT.date.today())
+    meta = self._read_meta()
+    frames = []
+    for month in self.months(fd, td):
+      key = str(month)
+      if month in self._loaded:
+        frames.append(self._loaded[month])
+        continue
+      info = meta.get(key, {})
+      path = self.shard_path(key)
+      if info.get("frozen") and os.path.exists(path):
+        app = from_columnar(pd.read_parquet(path))
+        if info.get("tags") != self.tag_signature(app["Process"].dropna().unique()):
+          app = retag(app)
+          self._write(key, app, meta, info["frozen"])
+      else:
+        app = build(month)
+        # over (with a day of margin for late exports): never changes again
+        frozen = bool(month.end_time < today - pd.Timedelta(days=1))
+        self._write(key, app, meta, frozen)
+      self._loaded[month] = app
+      frames.append(app)
+    self._write_meta(meta)
+    if not frames:
+      return pd.DataFrame()
+    app = pd.concat(frames, ignore_index=True)
+    days = app["Effective_Day"]
+    return app[(days >= pd.Timestamp(fd)) & (days <= pd.Timestamp(td))].reset_index(drop=True)
+
+  def _write(self, key, app, meta, frozen):
+    os.makedirs(self.path, exist_ok=True)
+    tmp = self.shard_path(key) + ".tmp"
+    to_columnar(app).to_parquet(tmp, index=False)
+    os.replace(tmp, self.shard_path(key))
+    processes = app["Process"].dropna().unique() if "Process" in app.columns else []
+    meta[key] = {"frozen": frozen, "tags": self.tag_signature(processes), "rows": len(app),
+                 "built": DT.datetime.now().isoformat(timespec="seconds")}
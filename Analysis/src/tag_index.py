@@ -0,0 +1,98 @@
+"""Case-insensitive hash index over the process_tags table.
+
+Tagging used to filter the whole process_tags frame for every unseen process
+and append rows one .loc at a time. ProcessTagIndex keeps a case-folded dict
+from process to (Category, Project, Label) next to the table and stays in
+sync as rows are added, so membership tests and lookups are O(1). Project
+names (and the titles rows were tagged from) also go into a TrigramIndex for
+fuzzy suggestions.
+"""
+import hashlib
+import pandas as pd
+from trigram_index import TrigramIndex
+
+COLUMNS = ["Process", "Category", "Project", "Label"]
+
+
+def tag_signature(process_tags, processes, rules_path=None):
+  """Hash of the process_tags rows that tag processes.
+
+  Rows of other processes do not count, so adding a process to
+  process_tags.csv leaves the signature of older data alone. Processes
+  without a row are still open to auto-assignment, so while there are any
+  the rules file counts too.
+  """
+  table = process_tags.reindex(columns=COLUMNS).astype({"Process": str}).drop_duplicates("Process")
+  rows = table.set_index("Process").reindex(sorted(set(map(str, processes))))
+  h = hashlib.sha1(rows.to_csv().encode("utf-8"))
+  if rules_path is not None and rows.isna().all(axis=1).any():
+    try:
+      with open(rules_path, "rb") as fh:
+        h.update(fh.read())
+    except OSError:
+      h.update(b"-")
+  return h.hexdigest()
+
+
+class ProcessTagIndex:
+
+  def __init__(self, process_tags, fuzzy=None):
+    for c in COLUMNS:
+      if c not in process_tags.columns:
+        process_tags[c] = None
+    self._base = process_tags
+    self._added = []
+    self._lookup = {}
+    self._projects = {}
+    self.fuzzy = fuzzy if fuzzy is not None else TrigramIndex()
+    for process, category, project, label in process_tags[COLUMNS].itertuples(index=False, name=None):
+      self._index(process, category, project, label)
+    # a saved fuzzy index may still point at projects renamed or removed since
+    self.fuzzy.retain(self._projects)
+
+  def _index(self, process, category, project, label):
+    if isinstance(process, str) or pd.notna(process):
+      # first row wins, like match.iloc[0] did
+      self._lookup.setdefault(str(process).lower(), (category, project, label))
+    if isinstance(project, str) or pd.notna(project):
+      if project not in self._projects:
+        self._projects[project] = (category, label)
+        self.fuzzy.add(project, project)
+
+  def __contains__(self, process):
+    return str(process).lower() in self._lookup
+
+  def __len__(self):
+    return len(self._base) + len(self._added)
+
+  def get(self, process):
+    """(Category, Project, Label) for process (case-insensitive) or None."""
+    return self._lookup.get(str(process).lower())
+
+  def projects(self):
+    """Distinct known projects in order of first appearance."""
+    return list(self._projects)
+
+  def project_tags(self, project):
+    """(Category, Label) of the first row with project, or None."""
+    return self._projects.get(project)
+
+  def add(self, process, category, project, label, title=None):
+    """Add a row; title is the window title it was tagged from, kept for fuzzy matching."""
+    self._added.append((process, category, project, label))
+    self._index(process, category, project, label)
+    if title and (isinstance(project, str) or pd.notna(project)):
+      self.fuzzy.add(title, project)
+
+  def similar(self, text, k=1, min_score=0.0):
+    """Top k [(project, score, matched text)] for text, see TrigramIndex.search."""
+    return self.fuzzy.search(text, k, min_score)
+
+  def frame(self):
+    """The process_tags table including every added row."""
+    if not self._added:
+      return self._base
+    added = pd.DataFrame(self._added, columns=COLUMNS)
+    if self._base.empty:
+      return added
+    return pd.concat([self._base, added], ignore_index=True)
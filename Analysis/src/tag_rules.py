@@ -0,0 +1,154 @@
+"""Compiled rule engine for data/tag_rules.json.
+
+All rule patterns are compiled once into a single regex of anchored named
+alternatives,
+
+  ^(?:[\s\S]*?(?P<r0>pattern0)|[\s\S]*?(?P<r1>pattern1)|...)
+
+so a single match() call finds the first rule (in file order) that matches
+anywhere in the string - the same result as looping re.search over the rules.
+The skip prefix matches newlines itself, so the rules keep their own
+meaning of "." (no DOTALL).
+Named groups inside a pattern are renamed per rule to keep them unique and
+mapped back for ${name} substitution in the project field.
+
+Engines are cached per rule file and recompiled only when its mtime changes.
+Resolved strings are memoized per engine in a bounded LRU cache.
+"""
+import os
+import re
+import json
+import functools
+import pandas as pd
+
+_GLOBAL_FLAGS = re.compile(r"^\(\?([aiLmsux]+)\)")
+_GROUP_NAME = re.compile(r"\(\?P<(\w+)>")
+_GROUP_REF = re.compile(r"\(\?P=(\w+)\)")
+_TOKEN = re.compile(r"\$\{(\w+)\}")
+# numbered group references cannot survive being embedded in the combined regex
+_NUMBERED_REF = re.compile(r"\\[1-9]|\(\?\(\d")
+MEMO_SIZE = 65536
+
+_cache = {}
+
+
+class RuleEngine:
+
+  def __init__(self, rules):
+    self.rules = []
+    alternatives = []
+    for rule in rules:
+      pattern = rule.get("pattern", "")
+      try:
+        re.compile(pattern, re.IGNORECASE)
+      except re.error:
+        # invalid rules are skipped, as apply_rules always did
+        continue
+      k = len(self.rules)
+      groups = {name: f"r{k}_{name}" for name in _GROUP_NAME.findall(pattern)}
+      alternatives.append(f"[\\s\\S]*?(?P<r{k}>{self._scope(pattern, groups)})")
+      project = rule.get("project")
+      self.rules.append({
+        "pattern": pattern,
+        "category": rule.get("category"),
+        "project": project,
+        "label": rule.get("label"),
+        "groups": groups,
+        "template": bool(project) and _TOKEN.search(project) is not None,
+      })
+    self.matcher, self.fallback = None, None
+    if any(_NUMBERED_REF.search(r["pattern"]) for r in self.rules):
+      self.fallback = [re.compile(r["pattern"], re.IGNORECASE) for r in self.rules]
+    elif alternatives:
+      self.matcher = re.compile("^(?:" + "|".join(alternatives) + ")", re.IGNORECASE)
+    self._resolve = functools.lru_cache(maxsize=MEMO_SIZE)(self._resolve_uncached)
+
+  @staticmethod
+  def _scope(pattern, groups):
+    """Make pattern embeddable: leading global flags become scoped, groups renamed."""
+    m = _GLOBAL_FLAGS.match(pattern)
+    if m:
+      flags = m.group(1).replace("i", "")
+      pattern = pattern[m.end():]
+      if flags:
+        pattern = f"(?{flags}:{pattern})"
+    pattern = _GROUP_NAME.sub(lambda mo: f"(?P<{groups[mo.group(1)]}>", pattern)
+    return _GROUP_REF.sub(lambda mo: f"(?P={groups[mo.group(1)]})", pattern)
+
+  def __len__(self):
+    return len(self.rules)
+
+  def _find(self, s):
+    """Return (rule index, {group: value}) of the first matching rule, or None."""
+    if self.fallback is not None:
+      for k, rx in enumerate(self.fallback):
+        m = rx.search(s)
+        if m:
+          return k, m.groupdict()
+      return None
+    if self.matcher is None:
+      return None
+    m = self.matcher.match(s)
+    if not m:
+      return None
+    # the rule's own group closes last, so it is the match's lastgroup
+    k = int(m.lastgroup[1:])
+    return k, {name: m.group(renamed) for name, renamed in self.rules[k]["groups"].items()}
+
+  def _resolve_uncached(self, s):
+    """(rule index, (category, project, label)); index -1 if no rule matches.
+
+    Called through self._resolve, its memoized version.
+    """
+    found = self._find(s)
+    result = (-1, (None, None, None))
+    if found is not None:
+      k, groups = found
+      rule = self.rules[k]
+      project = rule["project"]
+      if rule["template"]:
+        project = _TOKEN.sub(lambda mo: groups.get(mo.group(1)) or "", project)
+      result = (k, (rule["category"], project, rule["label"]))
+    return result
+
+  def match(self, s):
+    """Same result as the former apply_rules: {category, project, label} or None."""
+    k, (category, project, label) = self._resolve(s)
+    if k < 0:
+      return None
+    return {"category": category, "project": project, "label": label}
+
+  def classify(self, strings):
+    """Classify a whole column. Returns a frame with rule (-1 = no match),
+    category, project and label aligned to strings' index."""
+    strings = strings.astype(str)
+    unique = strings.unique()
+    rows = [(k,) + values for k, values in map(self._resolve, unique)]
+    table = pd.DataFrame(rows, columns=["rule", "category", "project", "label"], index=unique)
+    out = table.reindex(strings.to_numpy())
+    out.index = strings.index
+    return out
+
+
+def load_rules(path):
+  if not os.path.exists(path):
+    return []
+  try:
+    with open(path, "r", encoding="utf-8") as fh:
+      return json.load(fh)
+  except Exception:
+    return []
+
+
+def load_rule_engine(path):
+  """Cached RuleEngine for path; recompiled when the file's mtime changes."""
+  try:
+    mtime = os.stat(path).st_mtime_ns
+  except OSError:
+    mtime = None
+  cached = _cache.get(path)
+  if cached is not None and cached[0] == mtime:
+    return cached[1]
+  engine = RuleEngine(load_rules(path))
+  _cache[path] = (mtime, engine)
+  return engine
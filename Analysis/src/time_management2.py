@@ -1,12 +1,12 @@
 from os.path import exists
-from os import system
 import sys
 import os
+import asyncio
+import shutil
+import subprocess
 import datetime as DT
 from pathlib import Path
-import json
 import re
-import difflib
 from urllib.parse import urlparse
 import pandas as pd
 import numpy as np
@@ -16,6 +16,50 @@ import matplotlib.gridspec as gridspec
 import matplotlib.animation as animation
 import matplotlib.patches as mpatches
 from typing import Dict, Optional
+from app_cache import load_applications, parse_applications_csv, iter_applications_csv, AppendReader
+from history_store import HistoryStore, rows_after
+from tag_rules import RuleEngine, load_rules, load_rule_engine
+from tag_index import ProcessTagIndex, tag_signature
+from titles import parse_titles, ensure_titles, document, is_date_note
+from trigram_index import TrigramIndex
+from aggregates import to_seconds, build_cube, day_tag_seconds, fold, tag_hours, day_tag_hours, Timeline
+from rendering import panel_spec, render_panels, grid_rects, composite, RenderCache
+from watch import FileWatcher
+from compact import compact_text, compact_frame, memory_report
+from instrument import Tracer, traced
+from review_queue import ReviewQueue
+from activity_db import ActivityDB
+from shards import MonthShards
+from backfill import MTC_PATH, ParallelExport, mtc_command, export_async, windows
+from pipeline import report_range, union_range
+from rollups import Rollups
+
+def _literal_pattern(words):
+  """Compile a 'title contains any of words' matcher (case-sensitive, literal)."""
+  return re.compile("|".join(re.escape(w) for w in words))
+
+def _in_event_loop():
+  """True inside a running asyncio loop (e.g. Jupyter), where asyncio.run is not allowed."""
+  try:
+    asyncio.get_running_loop()
+  except RuntimeError:
+    return False
+  return True
+
+# (process, [(tag, title pattern), ...], tag when nothing matched); first match wins
+TITLE_RULES = [
+  ("Visual Studio Code", [
+    ("Main", _literal_pattern(["Passenger_Seo", "matar (Workspace)"])),
+  ], "Side Project"),
+  ("Firefox Developer Edition", [
+    ("Social", _literal_pattern(["YouTube", "Reddit", "Twitch", "Netflix", "Prime Video"])),
+    ("Side Project", _literal_pattern(["ChatGPT", "python", "tensorflow", "TensorFlow", "keras", "Zoom", "TU Berlin"])),
+    ("Main", _literal_pattern(["Unity", "unity", "c#", "C#"])),
+  ], "Browser"),
+]
+UNTAGGED = "Untagged"
+# least trigram similarity for a fuzzy project suggestion
+FUZZY_MIN_SCORE = 0.5
 
 class TimeManagement:
   """
@@ -36,7 +80,7 @@ class TimeManagement:
     "None": "black"
   }
 
-  def __init__(self, reloadTime, root_path, save_path, colors: Optional[Dict[str, str]] = None, export = True):
+  def __init__(self, reloadTime, root_path, save_path, colors: Optional[Dict[str, str]] = None, export = True, use_cache = True, incremental = False, day_start_hour = 7, timezone: Optional[str] = None, render_workers = 1, render_cache = False, compact = True, trace = False, headless = False, min_confidence = 0.8, backend = None, mtc = MTC_PATH, export_timeout = 600):
     if root_path is None:
       root_path = os.getcwd()
     self.root_path = root_path
@@ -44,17 +88,289 @@ class TimeManagement:
     self.reloadTime = reloadTime
     self.colors = colors if colors is not None else dict(self.DEFAULT_COLORS)
     self.export = export
+    self.use_cache = use_cache
+    self.incremental = incremental
+    # effective days start at day_start_hour local time; timezone (e.g. "Europe/Berlin")
+    # names the zone of the exported wall-clock times so DST days split exactly
+    self.day_start_hour = day_start_hour
+    self.timezone = timezone
+    # > 1 (or None = all cores): draw report panels in worker processes
+    self.render_workers = render_workers
+    # reuse bitmaps of report panels whose inputs did not change
+    self.render_cache = RenderCache(os.path.join(root_path, "data", ".cache", "render")) if render_cache else None
+    self.history = HistoryStore(root_path)
+    # keep self.app in the compact dtypes of compact.py
+    self.compact = compact
+    # per-stage timings and memory, also switched on by TM_TRACE (see instrument.py)
+    self.tracer = Tracer.from_env(root_path, trace)
+    # never prompt: accept suggestions >= min_confidence, queue the rest for review()
+    self.headless = headless
+    self.min_confidence = min_confidence
+    if headless:
+      self.colors = {UNTAGGED: "lightgrey", **self.colors}
+    # "sqlite": keep processed rows in data/activity.sqlite and read reports by date range
+    self.db = ActivityDB(root_path) if backend == "sqlite" else None
+    # "shards": processed rows in per-month files under data/shards, closed months frozen
+    self.shards = MonthShards(root_path) if backend == "shards" else None
+    self._ingested = False
+    # the mtc CLI: a path, or an argument list for a stand-in (see benchmarks/fake_mtc.py)
+    self.mtc = mtc
+    # seconds before an mtc export is given up (None: wait forever)
+    self.export_timeout = export_timeout
+    # daily / weekly totals and rolling means, updated with every import
+    self.rollups = Rollups(root_path)
 
   # Import & Preprocess Data
   # ==================================================================
+  @traced
   def import_and_preprocess(self, fd=None, td=None):
-    if self.export:
+    self._import(fd, td)
+    self._update_rollups(fd, td)
+
+  def _import(self, fd, td):
+    if self.db is not None:
+      return self._import_with_db(fd, td)
+    if self.shards is not None and fd is not None:
+      return self._set_app(self.shards.load(fd, td or DT.date.today(), self._build_month, self._retag))
+    if self.incremental and self.export and not _in_event_loop():
+      return self._set_app(asyncio.run(self._import_overlapped(fd, td)))
+    if self.incremental:
+      self.ingest_incremental()
+    elif self.export:
       self.export_app_data(fd, td)
-    app, process_tags = self.load_files()
+    app, process_tags = self.load_files(fd, td)
+    app = self.parse_titles(app)
     process_tags = self.tagging(app, process_tags)
     app = self.merge_tags(app, process_tags)
     app = self.create_effective_day(app)
-    self.app = app
+    self._set_app(app)
+
+  def _import_with_db(self, fd, td):
+    """Process new data into the database, then read back only [fd, td].
+
+    Without export nothing is parsed or tagged for days the database already
+    holds: the rows of the range and their cube come straight from SQLite.
+    Days of [fd, td] never stored are processed from the local data first.
+    """
+    if self.export or self.incremental:
+      if self.incremental:
+        self.ingest_incremental()
+      else:
+        self.export_app_data(fd, td)
+      app = self.load_files(fd, td)[0]
+      self.db.replace_days(self._process(app), fd, td)
+    else:
+      today = pd.Timestamp(DT.date.today())
+      gap = self.db.missing(fd, td or today)
+      app_path = os.path.join(self.root_path, "data", "applications.csv")
+      stamp = self._source_stamp(app_path)
+      if gap is not None and gap[0] is not None and gap[0] >= today and stamp == self.db.get_meta("open_days_source"):
+        # only today (still open) is missing and it was stored from this very file
+        gap = None
+      if gap is not None:
+        first, last = gap
+        print(f"Days {first.date() if first is not None else 'all'} - {last.date()} are not in the database yet, processing them")
+        app = load_applications(app_path, self.use_cache)
+        offset = pd.Timedelta(hours=self.day_start_hour)
+        # rows of effective days first .. last (`last` runs into the next morning)
+        keep = app.Start < last + pd.Timedelta(days=1) + offset
+        if first is not None:
+          keep &= app.End > first + offset
+        self.db.replace_days(self._process(app[keep].reset_index(drop=True)), first, last)
+        if last >= today:
+          self.db.set_meta("open_days_source", stamp)
+    self._set_app(self.db.activity(fd, td), self.db.cube(fd, td))
+
+  @staticmethod
+  def _source_stamp(path):
+    """mtime and size of path, to tell whether an export changed."""
+    try:
+      st = os.stat(path)
+    except OSError:
+      return None
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+  def _build_month(self, month):
+    """Processed rows of one month's effective days (for the shard store).
+
+    Rows are read from the day before the month to the day after it, so
+    activities crossing the month boundaries are split into the right month.
+    """
+    fd = month.start_time.date() - DT.timedelta(days=1)
+    td = month.end_time.date() + DT.timedelta(days=1)
+    app = self._load_range(fd, td, os.path.join(self.shards.path, "export.csv"))
+    return app[app.Effective_Day.dt.to_period("M") == month].reset_index(drop=True)
+
+  def _load_range(self, fd, td, export_path):
+    """Processed rows starting on fd..td, without touching self.app.
+
+    Exports the range to export_path in export mode, reads the history store
+    in incremental mode (ingesting once per run), else applications.csv.
+    """
+    if self.incremental:
+      if not self._ingested:
+        self.ingest_incremental()
+        self._ingested = True
+      app = self.history.load(fd, td)
+    elif self.export:
+      os.makedirs(os.path.dirname(export_path), exist_ok=True)
+      self.export_app_data(fd, td, export_path)
+      app = parse_applications_csv(export_path)
+    else:
+      app = load_applications(os.path.join(self.root_path, "data", "applications.csv"), self.use_cache)
+      app = app[(app.Start >= pd.Timestamp(fd)) & (app.Start < pd.Timestamp(td) + pd.Timedelta(days=1))]
+      app = app.reset_index(drop=True)
+    if app.empty:
+      # e.g. a month without data: stored as an empty shard, nothing to tag
+      return self._no_rows(app)
+    return self._process(app)
+
+  @staticmethod
+  def _no_rows(raw):
+    """The processed layout (columns and dtypes of _process) without rows."""
+    app = raw.iloc[0:0].copy()
+    for c in ("Document", "App_Suffix", "Site", "Is_Date_Note", "Category", "Project", "Label", "Tag"):
+      app[c] = pd.Series(dtype=bool if c == "Is_Date_Note" else "str")
+    app["Effective_Day"] = pd.Series(dtype=raw["Start"].dtype if "Start" in raw.columns else "datetime64[us]")
+    return app
+
+  def _process(self, app):
+    """Title parsing, tagging, merging and effective days for raw export rows."""
+    if self.compact:
+      compact_text(app)
+    app = self.parse_titles(app)
+    process_tags = self.tagging(app, self.load_process_tags(app))
+    app = self.merge_tags(app, process_tags)
+    return self.create_effective_day(app)
+
+  async def _import_overlapped(self, fd, td):
+    """Incremental import that processes the stored history while mtc exports.
+
+    The delta export (from the watermark's day) runs as a subprocess; the
+    stored rows of [fd, td] are tagged meanwhile in a worker thread. Only
+    the new rows are processed after the export, so the import takes about
+    max(export, processing). A failed or timed out export is reported and
+    the stored data is used as is.
+    """
+    app_path = os.path.join(self.root_path, "data", "applications.csv")
+    if self.history.is_empty() and exists(app_path):
+      self.history.append(load_applications(app_path, self.use_cache))
+    watermark = self.history.watermark()
+    delta_path = os.path.join(self.root_path, "data", "applications_delta.csv")
+    if exists(delta_path):
+      os.remove(delta_path)
+    export = asyncio.create_task(export_async(
+      self.mtc, delta_path, watermark.date() if watermark is not None else None, None, self.export_timeout))
+    raw = self.history.load(fd, td)
+    # nothing stored for [fd, td] (e.g. a fresh install): only the export runs
+    jobs = [export] + ([asyncio.to_thread(self._process, raw)] if not raw.empty else [])
+    # wait for both, so the export is appended even if processing fails
+    exported, *processed = await asyncio.gather(*jobs, return_exceptions=True)
+    stored = processed[0] if processed else None
+    added = None
+    if isinstance(exported, (OSError, RuntimeError, TimeoutError)):
+      print(f"Export failed ({exported}), reporting the stored history only")
+    elif isinstance(exported, BaseException):
+      raise exported
+    else:
+      added = self.history.append(parse_applications_csv(delta_path))
+      print(f"Ingested {len(added)} new rows (watermark {self.history.watermark()})")
+    if isinstance(stored, BaseException):
+      raise stored
+    parts = [stored] if stored is not None else []
+    if added is not None:
+      if fd is not None:
+        added = added[added.Start >= pd.Timestamp(fd)]
+      if td is not None:
+        added = added[added.Start < pd.Timestamp(td) + pd.Timedelta(days=1)]
+      if not added.empty:
+        parts.append(self._process(added.reset_index(drop=True)))
+    if not parts:
+      return self._process(raw)
+    return pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+
+  def _retag(self, app):
+    """Tag processed rows again after process_tags.csv / tag_rules.json changed."""
+    app = app.drop(columns=[c for c in ("Category", "Project", "Label", "Tag") if c in app.columns])
+    # undo tagging's "Obsidian" -> "Obsidian-<file name>" rewrite
+    process = app.Process.astype(object)
+    app["Process"] = process.where(process != "Obsidian-" + app.Document.astype(str), "Obsidian")
+    process_tags = self.tagging(app, self.load_process_tags(app))
+    return self.merge_tags(app, process_tags)
+
+  def _update_rollups(self, fd, td):
+    """Store the imported effective days in the rollups.
+
+    An import of [fd, td] holds the complete days fd .. td-1 (td itself is
+    complete only once its night has been exported, unless it is today and
+    still running); fd=None is the whole history and rebuilds them. Other
+    imports only extend the tables at their end: empty, stale or gapped
+    rollups are left to refresh_rollups (-alltime, -backfill), with a note
+    printed once.
+    """
+    if self.cube.empty:
+      return
+    today = pd.Timestamp(DT.date.today())
+    last = today if td is None or pd.Timestamp(td) >= today else pd.Timestamp(td) - pd.Timedelta(days=1)
+    first = None if fd is None else pd.Timestamp(fd)
+    if first is not None and first > last:
+      return
+    if first is not None and self.rollups.is_empty():
+      self._rollups_note("empty", "Rollups are empty, the all time report (-alltime) builds them from the whole history")
+      return
+    if first is not None and self._rollups_stale():
+      self._rollups_note("stale:" + self._tag_signature(self.rollups.meta().get("processes", [])),
+                         "Tags changed since the rollups were built, run -alltime to rebuild them")
+      return
+    seconds = self.cube.groupby(["Effective_Day", "Tag"])["Seconds"].sum()
+    days = seconds.index.get_level_values("Effective_Day")
+    keep = days <= last
+    if first is not None:
+      keep &= days >= first
+    processes = self.cube["Process"].dropna().unique()
+    stored = self.rollups.replace_days(seconds[keep], first, last, self._rollup_meta(processes, first is None))
+    if not stored and first is not None:
+      end = self.rollups.days()[1].date()
+      self._rollups_note(f"gap:{end}", f"Rollups end on {end}, not updated from {first.date()}; run -alltime to fill the gap")
+
+  def _rollups_note(self, key, message):
+    """Print message unless it was already printed for key (kept in the rollups metadata)."""
+    meta = self.rollups.meta()
+    if meta.get("noted") == key:
+      return
+    print(message)
+    meta["noted"] = key
+    self.rollups.save_meta()
+
+  def _tag_signature(self, processes):
+    process_tags = self.load_process_tags(pd.DataFrame({"Process": []}))
+    return tag_signature(process_tags, processes, os.path.join(self.root_path, "data", "tag_rules.json"))
+
+  def _rollup_meta(self, processes, rebuild=False):
+    """Rollups metadata after storing rows of processes: every process seen
+    so far and the signature of their tags."""
+    seen = set(map(str, processes))
+    if not rebuild:
+      seen |= set(self.rollups.meta().get("processes", []))
+    seen = sorted(seen)
+    return {"processes": seen, "tags": self._tag_signature(seen)}
+
+  def _rollups_stale(self):
+    """True if the tags of a process in the rollups changed since they were stored."""
+    meta = self.rollups.meta()
+    return not self.rollups.is_empty() and meta.get("tags") != self._tag_signature(meta.get("processes", []))
+
+  @traced(name="aggregate")
+  def _set_app(self, app, cube=None):
+    self.app = compact_frame(app) if self.compact else app
+    self.cube = build_cube(app) if cube is None else cube
+    self.timeline = None  # built on first line_chart
+
+  def memory_report(self):
+    """Bytes per column of self.app in the loose and the compact layout."""
+    report = memory_report(self.app)
+    print(report.to_string())
+    return report
 
   def month_import_and_preprocess(self, month):
     today = DT.date.today()
@@ -62,21 +378,94 @@ class TimeManagement:
     td = (today.replace(month=month+1, day=1) - DT.timedelta(days=1))
     self.import_and_preprocess(fd, td)
 
-  def export_app_data(self, fd, td):
+  @traced
+  def export_app_data(self, fd, td, app_path=None):
+    """Blocking mtc export into app_path; False (with a message) if it failed."""
+    app_path = app_path or os.path.join(self.root_path, "data", "applications.csv")
+    try:
+      done = subprocess.run(mtc_command(self.mtc, app_path, fd, td), timeout=self.export_timeout)
+    except (OSError, subprocess.TimeoutExpired) as exc:
+      print(f"Export failed: {exc}")
+      return False
+    if done.returncode != 0:
+      print(f"Export failed with exit code {done.returncode}")
+      return False
+    return True
+
+  @traced
+  def backfill(self, fd, td=None, window_days=7, workers=4, retries=2, rebuild=False):
+    """Export fd..td into the history store with parallel mtc runs.
+
+    The range is cut into window_days windows; each window's CSV is appended
+    as soon as all earlier windows are in. The store only takes rows newer
+    than its watermark, so days before it are skipped (an interrupted
+    backfill resumes where it stopped). rebuild=True exports fd..td into a
+    new store that then replaces the current one - for older history or an
+    all-time rebuild.
+    """
+    td = td or DT.date.today()
+    store = HistoryStore(self.root_path, "history.rebuild") if rebuild else self.history
+    if rebuild:
+      shutil.rmtree(store.path, ignore_errors=True)
+      # the new store replaces the old one, so it must reach as far
+      stored = self.history.watermark()
+      if stored is not None:
+        td = max(td, stored.date())
+    watermark = store.watermark()
+    if watermark is not None and fd < watermark.date():
+      print(f"History is stored up to {watermark}; backfilling from {watermark.date()} (use rebuild=True for older days)")
+      fd = watermark.date()
+    out_dir = os.path.join(self.root_path, "data", "backfill")
+    export = ParallelExport(self.mtc, out_dir, workers, retries)
+    added = 0
+    for (wfd, wtd), path in export.run(windows(fd, td, window_days)):
+      added += len(store.append(parse_applications_csv(path)))
+      os.remove(path)
+    if rebuild:
+      self.history.replace_with(store)
+    print(f"Backfilled {added} rows for {fd} - {td} (watermark {self.history.watermark()})")
+    if added and self.incremental:
+      # older days cannot be joined onto the rollups: rebuild them from the new history
+      self.refresh_rollups(rebuild=rebuild)
+    return added
+
+  @traced
+  def ingest_incremental(self):
+    """Export only rows newer than the history watermark and append them.
+
+    Returns the rows appended by the export. An empty history is seeded from an existing applications.csv (the last
+    full export), so switching to incremental mode does not re-export months.
+    """
     app_path = os.path.join(self.root_path, "data", "applications.csv")
-    if fd is None and td is None:
-      system('"/Program Files/ManicTime/mtc" export ManicTime/Applications ' + app_path)
+    if self.history.is_empty() and exists(app_path):
+      self.history.append(load_applications(app_path, self.use_cache))
+    if not self.export:
+      return pd.DataFrame()
+    watermark = self.history.watermark()
+    delta_path = os.path.join(self.root_path, "data", "applications_delta.csv")
+    # export from the watermark's day; the overlap is dropped by the store
+    if exists(delta_path):
+      os.remove(delta_path)
+    if self.export_app_data(watermark.date() if watermark is not None else None, None, delta_path) and exists(delta_path):
+      added = self.history.append(parse_applications_csv(delta_path))
+      print(f"Ingested {len(added)} new rows (watermark {self.history.watermark()})")
+      return added
+    return pd.DataFrame()
+
+  @traced
+  def load_files(self, fd=None, td=None):
+    if self.incremental:
+      app = self.history.load(fd, td)
     else:
-      system('"/Program Files/ManicTime/mtc" export ManicTime/Applications ' + app_path + " /fd:" + str(fd) + " /td:" + str(td))
-    return
-
-  def load_files(self):
-    app_path = os.path.join(self.root_path, "data", "applications.csv")
-    app = pd.read_csv(app_path, delimiter=",")
-    app.Start = pd.to_datetime(app.Start)
-    app.End = pd.to_datetime(app.End)
-    app.Duration = pd.to_timedelta(app.Duration)
-
+      app_path = os.path.join(self.root_path, "data", "applications.csv")
+      # parsed columnar copy of the CSV, rebuilt only when the export changes
+      app = load_applications(app_path, self.use_cache)
+    if self.compact:
+      # before tagging and splitting, so no loose copy of the text is kept
+      compact_text(app)
+    return app, self.load_process_tags(app)
+
+  def load_process_tags(self, app):
     process_tags_path = os.path.join(self.root_path, "data", "process_tags.csv")
     if exists(process_tags_path):
       process_tags = pd.read_csv(process_tags_path)
@@ -116,17 +505,16 @@ class TimeManagement:
           process_tags["Label"] = None
     else:
       process_tags = pd.DataFrame(columns=["Process", "Category", "Project", "Label"]) 
-    return app, process_tags
+    return process_tags
 
   def is_date(self, date_string: str) -> bool:
     """Return True if date_string matches known date formats."""
-    for fmt in ("%d.%m.%Y", "%Y-%m-%d"):
-      try:
-        DT.datetime.strptime(date_string, fmt)
-        return True
-      except ValueError:
-        continue
-    return False
+    return is_date_note(date_string)
+
+  @traced
+  def parse_titles(self, app):
+    """Document, App_Suffix, Site and Is_Date_Note columns from Name (see titles.py)."""
+    return parse_titles(app)
 
   # Tagging helpers
   # ----------------
@@ -140,71 +528,76 @@ class TimeManagement:
   # New helpers for rule-driven tagging
   def load_tag_rules(self, path=None):
     path = path or os.path.join(self.root_path, "data", "tag_rules.json")
-    if not os.path.exists(path):
-      return []
-    try:
-      with open(path, "r", encoding="utf-8") as fh:
-        return json.load(fh)
-    except Exception:
-      return []
+    return load_rules(path)
+
+  def rule_engine(self, path=None):
+    """Compiled tag rules, cached until tag_rules.json changes."""
+    path = path or os.path.join(self.root_path, "data", "tag_rules.json")
+    return load_rule_engine(path)
 
   def apply_rules(self, process, name, rules):
-    s = f"{process} {name}"
-    for r in rules:
-      try:
-        if re.search(r.get("pattern", ""), s, flags=re.IGNORECASE):
-          project = r.get("project")
-          m = re.search(r.get("pattern", ""), s, flags=re.IGNORECASE)
-          if project and m:
-            # substitute ${name} style tokens with groupdict values
-            def sub(mo):
-              key = mo.group(1)
-              return m.groupdict().get(key, "") if m and key in m.groupdict() else ""
-            project = re.sub(r"\$\{(\w+)\}", sub, project)
-          return {"category": r.get("category"), "project": project, "label": r.get("label")}
-      except re.error:
-        continue
-    return None
+    if not isinstance(rules, RuleEngine):
+      rules = RuleEngine(rules)
+    return rules.match(f"{process} {name}")
+
+  def _rule_sample_names(self, app, engine):
+    """Per process, the first title a tag rule matches, else its first title.
+
+    The rules run over every title of the process (one column-wide classify)
+    rather than over a single sample row.
+    """
+    names = app.Name.astype(str)
+    hit = (engine.classify(app.Process.astype(str) + " " + names)["rule"] >= 0).to_numpy()
+    samples = names.groupby(app.Process).first()
+    if hit.any():
+      samples.update(names[hit].groupby(app.Process[hit]).first())
+    return samples.to_dict()
 
   def auto_assign_tag(self, process, name, process_tags_df, rules):
+    # process_tags_df may be the table or an already built ProcessTagIndex
+    index = process_tags_df if isinstance(process_tags_df, ProcessTagIndex) else ProcessTagIndex(process_tags_df)
+
+    # every suggestion carries a confidence in [0, 1] for headless tagging
     # 1) exact match in process_tags (case-insensitive)
-    if not process_tags_df.empty:
-      match = process_tags_df[process_tags_df.Process.str.lower() == str(process).lower()]
-      if not match.empty:
-        row = match.iloc[0]
-        return {"category": row.get("Category"), "project": row.get("Project"), "label": row.get("Label")}
+    known = index.get(process)
+    if known is not None:
+      category, project, label = known
+      return {"category": category, "project": project, "label": label, "confidence": 1.0}
 
     # 2) apply rules from tag_rules.json
     r = self.apply_rules(process, name, rules)
     if r:
-      return r
+      return dict(r, confidence=0.95)
 
     # 3) special-case Obsidian
     if str(process).lower().startswith("obsidian"):
-      filename = str(name).split(" - ")[0].split("-")[0]
+      filename = document(name).split("-")[0]
       if self.is_date(filename):
-        return {"category": "Journaling", "project": "DailyNotes", "label": "Journaling"}
-      return {"category": "Side", "project": f"Obsidian:{filename}", "label": filename}
+        return {"category": "Journaling", "project": "DailyNotes", "label": "Journaling", "confidence": 0.95}
+      return {"category": "Side", "project": f"Obsidian:{filename}", "label": filename, "confidence": 0.5}
 
     # 4) basic firefox heuristics
     if str(process).lower().startswith("firefox"):
       nm = str(name).lower()
       if any(x in nm for x in ["youtube", "reddit", "twitch", "netflix", "prime video"]):
-        return {"category": "Social", "project": "Browser", "label": "Browser"}
+        return {"category": "Social", "project": "Browser", "label": "Browser", "confidence": 0.75}
       if any(x in nm for x in ["chatgpt", "python", "tensorflow", "zoom", "tu berlin"]):
-        return {"category": "Side", "project": "Research", "label": "Side Project"}
-      return {"category": "Browser", "project": "Browser", "label": "Browser"}
-
-    # 5) fuzzy match against existing projects
-    existing_projects = []
-    if not process_tags_df.empty and "Project" in process_tags_df.columns:
-      existing_projects = [p for p in process_tags_df.Project.dropna().unique()]
-    best = difflib.get_close_matches(str(name), existing_projects, n=1, cutoff=0.7)
-    if best:
-      return {"category": None, "project": best[0], "label": best[0]}
+        return {"category": "Side", "project": "Research", "label": "Side Project", "confidence": 0.75}
+      return {"category": "Browser", "project": "Browser", "label": "Browser", "confidence": 0.5}
+
+    # 5) fuzzy match against existing projects and the titles they were tagged from
+    for project, score, _ in index.similar(name, k=3, min_score=FUZZY_MIN_SCORE):
+      tags = index.project_tags(project)
+      if tags is None:
+        # matched a project that is no longer in process_tags
+        continue
+      category, label = tags
+      return {"category": category, "project": project, "label": label if label is not None else project,
+              "confidence": round(score * 0.9, 3)}
 
     return None
 
+  @traced
   def tagging(self, app, process_tags):
     """Interactive tagging for unknown processes and Obsidian files.
 
@@ -213,36 +606,38 @@ class TimeManagement:
     - try fuzzy / heuristics
     - prompt only for unknown items and persist hierarchical columns
     """
+    app = ensure_titles(app)
     skipped = []
+    queued = {}  # headless: key -> suggestion below min_confidence (or None)
     no_need = ["Firefox Developer Edition", "Firefox", "Visual Studio Code"]
 
-    # load tag rules
-    rules = self.load_tag_rules()
+    # compiled tag rules
+    rules = self.rule_engine()
+
+    # case-folded lookup over process_tags (also ensures the expected columns)
+    index = ProcessTagIndex(process_tags, self.trigram_index())
 
-    # Ensure process_tags has expected columns
-    for c in ["Process", "Category", "Project", "Label"]:
-      if c not in process_tags.columns:
-        process_tags[c] = None
+    # processes that still need a tag, with one sample title each
+    pending = [p for p in app.Process.unique() if p not in no_need and p not in index]
+    sample_names = self._rule_sample_names(app[app.Process.isin(pending)], rules) if pending else {}
 
     # iterate through unique processes
-    for process in app.Process.unique():
-      if process in no_need:
-        continue
-      # skip if already present (case-insensitive)
-      if process_tags.Process.dropna().str.lower().isin([str(process).lower()]).any():
+    for process in pending:
+      # skip if added meanwhile (case-insensitive)
+      if process in index:
         continue
 
-      sample_name = ""
-      rows = app[app.Process == process]
-      if not rows.empty:
-        sample_name = str(rows.Name.iloc[0])
+      sample_name = sample_names.get(process, "")
 
-      suggestion = self.auto_assign_tag(process, sample_name, process_tags, rules)
+      suggestion = self.auto_assign_tag(process, sample_name, index, rules)
+      if self.headless:
+        self._assign_or_queue(process, sample_name, suggestion, index, queued)
+        continue
       if suggestion:
         display = f"{suggestion.get('category')}/{suggestion.get('project')}/{suggestion.get('label')}"
         conf = input(f"Auto-assign '{process}' -> {display}. Accept? (Enter=Yes / n=No / e=Edit): ")
         if conf.strip().lower() in ["", "y", "yes"]:
-          process_tags.loc[len(process_tags)] = [process, suggestion.get('category'), suggestion.get('project'), suggestion.get('label')]
+          index.add(process, suggestion.get('category'), suggestion.get('project'), suggestion.get('label'), sample_name)
           continue
         if conf.strip().lower() == 'n':
           skipped.append(process)
@@ -258,23 +653,25 @@ class TimeManagement:
       if not proj:
         proj = process
       label = input(f"Label (display) for '{process}' (Enter to use project '{proj}'): ") or proj
-      process_tags.loc[len(process_tags)] = [process, cat, proj, label]
+      index.add(process, cat, proj, label, sample_name)
 
     # Special case: Obsidian — split by file name prefix and prompt/save per-file rules
-    if (app.Process == "Obsidian").any():
-      obsidian_names = app[app.Process == "Obsidian"].Name.apply(lambda x: str(x).split(' - ')[0].split('-')[0]).unique()
+    is_obsidian = app.Process == "Obsidian"
+    if is_obsidian.any():
+      # daily notes: journaling handled in merge_tags
+      obsidian_names = app.Document[is_obsidian & ~app.Is_Date_Note.astype(bool)].astype(str).unique()
       for filename in obsidian_names:
-        if self.is_date(filename):
-          # journaling handled in merge_tags
-          continue
         name = f"Obsidian-{filename}"
-        if process_tags.Process.dropna().str.lower().isin([str(name).lower()]).any():
+        if name in index:
+          continue
+        suggestion = self.auto_assign_tag(name, filename, index, rules)
+        if self.headless:
+          self._assign_or_queue(name, filename, suggestion, index, queued)
           continue
-        suggestion = self.auto_assign_tag(name, filename, process_tags, rules)
         if suggestion:
           conf = input(f"Auto-assign '{name}' -> {suggestion}. Accept? (Enter=Yes / n=No / e=Edit): ")
           if conf.strip().lower() in ["", "y", "yes"]:
-            process_tags.loc[len(process_tags)] = [name, suggestion.get('category'), suggestion.get('project'), suggestion.get('label')]
+            index.add(name, suggestion.get('category'), suggestion.get('project'), suggestion.get('label'), filename)
             continue
         # Manual fallback
         cat = input(f"Category for '{name}' (Main/Side/Game/Other) or Enter to skip: ")
@@ -283,17 +680,49 @@ class TimeManagement:
           continue
         proj = input(f"Project name for '{name}' (or Enter to use '{filename}'): ") or filename
         label = input(f"Label for '{name}' (Enter to use project '{proj}'): ") or proj
-        process_tags.loc[len(process_tags)] = [name, cat, proj, label]
+        index.add(name, cat, proj, label, filename)
+
+    if queued:
+      self._queue_for_review(app, queued)
 
     # Replace "Obsidian" process entries in app with "Obsidian-<filename>"
-    for i, row in app[app.Process == "Obsidian"].iterrows():
-      filename = str(row.Name).split(" - ")[0]
-      app.at[i, "Process"] = f"Obsidian-{filename}"
+    if is_obsidian.any():
+      if isinstance(app.Process.dtype, pd.CategoricalDtype):
+        app["Process"] = app.Process.astype(object)
+      app.loc[is_obsidian, "Process"] = "Obsidian-" + app.Document[is_obsidian].astype(str)
 
     if skipped:
       print("Skipped tagging on: ", skipped)
 
-    # normalize and save
+    return self.save_process_tags(index)
+
+  def trigram_index(self):
+    """Persisted fuzzy index over projects and tagged titles.
+
+    Reloaded whenever process_tags.csv changed on disk (e.g. edited while
+    watching), so it never suggests projects that were renamed or removed.
+    """
+    tags_path = os.path.join(self.root_path, "data", "process_tags.csv")
+    try:
+      st = os.stat(tags_path)
+      stamp = (st.st_mtime_ns, st.st_size)
+    except OSError:
+      stamp = None
+    if getattr(self, "_trigrams", None) is None or stamp != self._trigrams_stamp:
+      self._trigrams = TrigramIndex.load(os.path.join(self.root_path, "data", ".cache", "trigrams.json"))
+      self._trigrams_stamp = stamp
+    return self._trigrams
+
+  def save_process_tags(self, index):
+    """Normalize, sort and write process_tags.csv; returns the table."""
+    if index.fuzzy.dirty:
+      index.fuzzy.save(os.path.join(self.root_path, "data", ".cache", "trigrams.json"))
+    process_tags = self._write_process_tags(index.frame())
+    if self.db is not None:
+      self.db.put_process_tags(process_tags)
+    return process_tags
+
+  def _write_process_tags(self, process_tags):
     process_tags["Process"] = process_tags["Process"].astype(str)
     # ensure columns order
     cols = [c for c in ["Process", "Category", "Project", "Label"] if c in process_tags.columns]
@@ -303,9 +732,69 @@ class TimeManagement:
     process_tags.to_csv(os.path.join(self.root_path, "data", "process_tags.csv"), index=False)
     return process_tags
 
+  # Headless tagging and review
+  # -----------------------------------
+  def _assign_or_queue(self, key, title, suggestion, index, queued):
+    if suggestion and suggestion.get("confidence", 0) >= self.min_confidence:
+      index.add(key, suggestion.get('category'), suggestion.get('project'), suggestion.get('label'), title)
+    else:
+      queued[key] = suggestion
+
+  def _queue_for_review(self, app, queued):
+    """Add the queued keys to the review queue with sample titles and hours."""
+    names = app.Name.astype(str)
+    keys = app.Process.astype(str)
+    is_obsidian = (keys == "Obsidian").to_numpy()
+    keys = keys.where(~is_obsidian, "Obsidian-" + app.Document.astype(str))
+    rows = keys.isin(list(queued)).to_numpy()
+    hours = to_seconds(app.Duration[rows]).groupby(keys[rows]).sum() / 3600
+    samples = names[rows].groupby(keys[rows]).unique()
+    queue = ReviewQueue(self.root_path)
+    for key, suggestion in queued.items():
+      queue.add(key, samples.get(key, []), hours.get(key, 0.0), suggestion)
+    queue.save()
+    print(f"Queued {len(queued)} untagged items for review ({len(queue)} open), run with -review")
+
+  def review(self):
+    """Walk the review queue by hours affected and apply the answers in one go.
+
+    Answer per item: Enter accepts the suggestion, "Category/Project/Label"
+    (Project and Label optional) sets a tag, "s" skips, "q" stops.
+    """
+    queue = ReviewQueue(self.root_path)
+    index = ProcessTagIndex(self.load_process_tags(pd.DataFrame({"Process": []})), self.trigram_index())
+    answered = 0
+    for key, item in queue.by_hours():
+      if key in index:
+        queue.remove(key)
+        continue
+      suggestion = item.get("suggestion") or {}
+      display = "/".join(str(suggestion.get(k)) for k in ("category", "project", "label")) if suggestion else "-"
+      print(f"\n{key}  ({item.get('hours', 0):.1f} h)  suggestion: {display}")
+      for sample in item.get("samples", []):
+        print(f"    {sample}")
+      answer = input("Enter=accept / Category[/Project[/Label]] / s=skip / q=quit: ").strip()
+      if answer.lower() == "q":
+        break
+      if answer.lower() == "s" or (not answer and not suggestion):
+        continue
+      if answer:
+        parts = [p.strip() for p in answer.split("/")] + [None, None]
+        category, project, label = parts[0], parts[1] or key, parts[2] or parts[1] or key
+      else:
+        category, project, label = suggestion.get("category"), suggestion.get("project"), suggestion.get("label")
+      index.add(key, category, project, label, (item.get("samples") or [None])[0])
+      queue.remove(key)
+      answered += 1
+    self.save_process_tags(index)
+    queue.save()
+    print(f"Tagged {answered} items, {len(queue)} left in the review queue")
+
   # Merge tags and apply special rules
   # -----------------------------------
+  @traced
   def merge_tags(self, app, process_tags):
+    app = ensure_titles(app)
     app = pd.merge(app, process_tags, how="left", left_on="Process", right_on="Process")
     # populate legacy 'Tag' column used by plotting and other methods
     if "Label" in app.columns:
@@ -314,57 +803,106 @@ class TimeManagement:
       app["Tag"] = app["Project"].fillna(app.get("Tag"))
 
     # apply special rules after initial assignment
-    self._apply_vsc_rules(app)
-    self._apply_firefox_rules(app)
-    self._apply_obsidian_rules(app)
+    self._apply_title_rules(app)
     # ensure Tag exists
     if "Tag" not in app.columns:
       app["Tag"] = None
+    if self.headless:
+      # queued for review: counted, but under one label until answered
+      app["Tag"] = app["Tag"].fillna(UNTAGGED)
     return app
 
-  def _apply_vsc_rules(self, app):
-    for i, row in app[app.Process == "Visual Studio Code"].iterrows():
-      if any(x in row.Name for x in ["Passenger_Seo", "matar (Workspace)"]):
-        app.at[i, "Tag"] = "Main"
-      else:
-        app.at[i, "Tag"] = "Side Project"
-
-  def _apply_firefox_rules(self, app):
-    for i, row in app[app.Process == "Firefox Developer Edition"].iterrows():
-      name = row.Name
-      if any(x in name for x in ["YouTube", "Reddit", "Twitch", "Netflix", "Prime Video"]):
-        app.at[i, "Tag"] = "Social"
-      elif any(x in name for x in ["ChatGPT", "python", "tensorflow", "TensorFlow", "keras", "Zoom", "TU Berlin"]):
-        app.at[i, "Tag"] = "Side Project"
-      elif any(x in name for x in ["Unity", "unity", "c#", "C#"]):
-        app.at[i, "Tag"] = "Main"
-      else:
-        app.at[i, "Tag"] = "Browser"
+  def _apply_title_rules(self, app):
+    """VS Code / Firefox / Obsidian special cases as one vectorized pass.
 
-  def _apply_obsidian_rules(self, app):
-    # Rows where Process starts with "Obsidian-": mark journaling if the filename is a date
-    mask = app.Process.str.startswith("Obsidian-")
-    for i, row in app[mask].iterrows():
-      filename = row.Name.split(" - ")[0]
-      if self.is_date(filename):
-        app.at[i, "Tag"] = "Journaling"
+    Every (process, title substrings) rule becomes a boolean mask; np.select
+    picks the first matching rule per row and keeps the merged Tag elsewhere.
+    """
+    names = app["Name"].astype(object).fillna("").astype(str)
+    conditions, choices = [], []
+    for process, rules, fallback in TITLE_RULES:
+      is_process = (app["Process"] == process).to_numpy()
+      for tag, pattern in rules:
+        conditions.append(is_process & names.str.contains(pattern, na=False).to_numpy())
+        choices.append(tag)
+      conditions.append(is_process)
+      choices.append(fallback)
+    # Obsidian daily notes: the file name (before " - ") is a date
+    is_obsidian = app["Process"].astype(str).str.startswith("Obsidian-").to_numpy()
+    conditions.append(is_obsidian & app["Is_Date_Note"].to_numpy(dtype=bool))
+    choices.append("Journaling")
+    current = app["Tag"].to_numpy(dtype=object) if "Tag" in app.columns else np.full(len(app), None, dtype=object)
+    app["Tag"] = np.select(conditions, choices, default=current)
 
   # Effective day calculation
   # -------------------------
+  @traced
   def create_effective_day(self, app):
-    threshold_hour = 7  # entries before 07:00 belong to previous effective day
-    app['Effective_Day'] = app['Start'].apply(lambda x: x - DT.timedelta(days=1) if x.hour < threshold_hour else x)
-    app['Effective_Day'] = app['Effective_Day'].dt.floor('D')
+    """Effective day = calendar day of Start shifted back by day_start_hour.
+
+    Rows running across a day boundary are split there first, so every row
+    belongs to exactly one effective day and day totals are exact.
+    """
+    offset = pd.Timedelta(hours=self.day_start_hour)
+    app = self._split_at_day_boundary(app, offset)
+    if app.empty and not pd.api.types.is_datetime64_any_dtype(app.get('Start')):
+      # e.g. a month or range without rows: nothing to split, keep the column
+      app['Effective_Day'] = pd.Series(dtype='datetime64[ns]')
+      return app
+    app['Effective_Day'] = (app['Start'] - offset).dt.floor('D')
     return app
 
+  def _split_at_day_boundary(self, app, offset):
+    if app.empty:
+      return app
+    parts = []
+    todo = app
+    while not todo.empty:
+      boundary = (todo['Start'] - offset).dt.floor('D') + pd.Timedelta(days=1) + offset
+      crosses = (todo['End'] > boundary).to_numpy()
+      if not crosses.any():
+        parts.append(todo)
+        break
+      parts.append(todo[~crosses])
+      cut = boundary[crosses]
+      head = todo[crosses].copy()
+      tail = todo[crosses].copy()
+      head_duration = self._elapsed(head['Start'], cut).clip(upper=head['Duration'])
+      head['End'] = cut
+      head['Duration'] = head_duration
+      tail['Start'] = cut
+      tail['Duration'] = tail['Duration'] - head_duration
+      parts.append(head)
+      todo = tail  # may cross further boundaries
+    if len(parts) == 1:
+      return parts[0]
+    # stable sort on the original index keeps each piece next to its origin
+    return pd.concat(parts).sort_index(kind='stable').reset_index(drop=True)
+
+  def _elapsed(self, start, end):
+    """end - start in real time; wall-clock difference unless a timezone is set."""
+    wall = end - start
+    if self.timezone is None:
+      return wall
+    real = (end.dt.tz_localize(self.timezone, ambiguous='NaT', nonexistent='shift_forward')
+            - start.dt.tz_localize(self.timezone, ambiguous='NaT', nonexistent='shift_forward'))
+    return real.fillna(wall)
+
   # Plot helpers
   # ==================================================================
+  def _colors_for(self, tags):
+    """Color per tag; tags without a configured color (e.g. from rules) are black, as in pie charts."""
+    return {tag: self.colors.get(tag, "black") for tag in tags}
+
   def _legend_handles(self):
     return [mpatches.Patch(color=color, label=label) for label, color in self.colors.items()]
 
   # Multi-figure assembly
   # ---------------------
+  @traced
   def three_week_summary(self, td):
+    if self._panel_mode():
+      return self._three_week_summary_panels(td)
     rows, cols = 4, 7
     fig = plt.figure(figsize=(100, 100))
     plt.rcParams.update({'font.size': 22})
@@ -407,7 +945,10 @@ class TimeManagement:
     plt.savefig(os.path.join(self.save_path, "three_week_summary.jpg"))
     return
 
+  @traced
   def month_view(self, month):
+    if self._panel_mode():
+      return self._month_view_panels(month)
     rows, cols = 5, 7
     fig = plt.figure(figsize=(100, 100))
     plt.rcParams.update({'font.size': 22})
@@ -436,16 +977,114 @@ class TimeManagement:
     plt.savefig(os.path.join(self.save_path, f"month_view_{month}.jpg"))
     return
 
+  # Panel rendering (parallel and/or cached)
+  # ----------------------------------------
+  REPORT_SIZE = (5000, 2500)  # 50 x 25 inches at 100 dpi, as the pyplot reports
+  REPORT_STYLE = {'font.size': 22}
+
+  def _panel_mode(self):
+    return self.render_workers != 1 or self.render_cache is not None
+
+  def _day_title(self, date):
+    return ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"][date.weekday()] + " " + str(date)
+
+  def _pie_spec(self, date, rect, title_px, title=None, style=None):
+    hours = self._pie_hours(self.app, date)
+    if hours.empty:
+      return None
+    return panel_spec("pie", rect, list(hours.items()), self.colors, self._day_title(date) if title is None else title,
+                      self.REPORT_STYLE if style is None else style, title_px=title_px)
+
+  def _line_spec(self, date, rect, title_px, title=None, style=None, legend=True, **options):
+    x, series = self._timeline(self.app).arrays(date)
+    if not series:
+      return None
+    return panel_spec("line", rect, (x, series), self.colors, self._day_title(date) if title is None else title,
+                      self.REPORT_STYLE if style is None else style, title_px=title_px, legend=legend, **options)
+
+  def _legend_spec(self):
+    width, height = self.REPORT_SIZE
+    x = int(0.92 * width)
+    return panel_spec("legend", (x, 0, width - x, height), None, self.colors, style=self.REPORT_STYLE)
+
+  def _render_report(self, specs, filename, size=None):
+    specs = [s for s in specs if s is not None]
+    if getattr(self, "_deferred", None) is not None:
+      # run_reports renders the panels of all reports in one pool
+      self._deferred.append((specs, filename, size))
+      return
+    images = render_panels(specs, self.render_workers, self.render_cache)
+    composite(size or self.REPORT_SIZE, specs, images, os.path.join(self.save_path, filename))
+    if self.render_cache is not None:
+      stats = self.render_cache.stats()
+      print(f"Render cache after {filename}: {stats['hits']} hits, {stats['misses']} misses")
+      self.render_cache.prune()
+
+  def _three_week_summary_panels(self, td):
+    """three_week_summary drawn panel by panel in worker processes."""
+    rect_of, title_px = grid_rects(self.REPORT_SIZE, 4, 7, hspace=0.1, top=0.9, bottom=0.1)
+    fd = td - DT.timedelta(days=td.weekday()+14)
+    specs = [self._pie_spec(fd + DT.timedelta(days=i), rect_of(i // 7, i % 7), title_px) for i in range(21)]
+    for i in range(3):
+      date = td - DT.timedelta(days=2-i)
+      specs.append(self._line_spec(date, rect_of(3, slice(2*i, 2*(i+1))), title_px, legend=(i == 0)))
+    specs.append(self._legend_spec())
+    self._render_report(specs, "three_week_summary.jpg")
+
+  def _month_view_panels(self, month):
+    """month_view drawn panel by panel in worker processes (one pie per day)."""
+    fd = DT.date.today().replace(month=month, day=1)
+    days = (pd.Timestamp(fd) + pd.offsets.MonthEnd(0)).day
+    rows = -(-(fd.weekday() + days) // 7)
+    rect_of, title_px = grid_rects(self.REPORT_SIZE, rows, 7, hspace=0.1, top=0.9, bottom=0.1)
+    specs = []
+    for i in range(days):
+      j = fd.weekday() + i
+      specs.append(self._pie_spec(fd + DT.timedelta(days=i), rect_of(j // 7, j % 7), title_px))
+    specs.append(self._legend_spec())
+    self._render_report(specs, f"month_view_{month}.jpg")
+
+  def _summary_panels(self, td):
+    """summary drawn as cached / parallel panels."""
+    size = (1000, 900)
+    rect_of, title_px = grid_rects(size, 3, 3, hspace=0.1, top=0.9, bottom=0.1)
+    specs = [self._line_spec(td, rect_of(0, slice(None)), title_px, "Today's recap", style={})]
+    for k in range(3):
+      date = td - DT.timedelta(days=2-k)
+      title = "3day recap" if k == 1 else pd.Timestamp(date).strftime("%a %d.%m")
+      specs.append(self._pie_spec(date, rect_of(1, k), title_px, title, style={}))
+    pivot_df = day_tag_hours(self.cube, pd.Timestamp(td - DT.timedelta(days=6)), pd.Timestamp(td))
+    if not pivot_df.empty:
+      labels = list(pivot_df.index.strftime("%a %d-%m"))
+      series = {tag: pivot_df[tag].to_numpy() for tag in pivot_df.columns}
+      specs.append(panel_spec("bar", rect_of(2, slice(None)), (labels, series), self.colors, "Week recap",
+                              {}, title_px=title_px, margins=(0.06, 0.3)))
+    self._render_report(specs, "summary.jpg", size)
+
+  def _week_summary_panels(self, td):
+    """week_summary drawn as cached / parallel panels."""
+    size = (1000, 1300)
+    rect_of, title_px = grid_rects(size, 7, 2, hspace=0.4, top=0.97, bottom=0.03)
+    specs = []
+    for i in range(7):
+      date = td - DT.timedelta(days=7-i)
+      specs.append(self._line_spec(date, rect_of(i, 0), title_px, "", style={}, legend=(i == 0), margins=(0.15, 0.15)))
+      specs.append(self._pie_spec(date, rect_of(i, 1), title_px, pd.Timestamp(date).strftime("%a %d.%m"), style={}))
+    self._render_report(specs, "week_report.jpg", size)
+
+  @traced
   def summary(self, td):
+    if self._panel_mode():
+      return self._summary_panels(td)
     fig = plt.figure(figsize=(100, 100))
     gs = gridspec.GridSpec(3, 3, figure=fig, hspace=0.1, top=0.9, bottom=0.1)
 
     ax = self.line_chart(self.app, td, ax=plt.subplot(gs[0,:]))
     ax.set_title("Today's recap")
 
-    self.pie_chart(self.app, td - DT.timedelta(days=2), plt.subplot(gs[1,0]))
-    ax = self.pie_chart(self.app, td - DT.timedelta(days=1), plt.subplot(gs[1,1]))
-    self.pie_chart(self.app, td, plt.subplot(gs[1,2]))
+    self.pie_chart(self.app, td - DT.timedelta(days=2), ax=plt.subplot(gs[1,0]))
+    ax = self.pie_chart(self.app, td - DT.timedelta(days=1), ax=plt.subplot(gs[1,1]))
+    self.pie_chart(self.app, td, ax=plt.subplot(gs[1,2]))
     ax.set_title("3day recap")
 
     week_ago = td - DT.timedelta(days=7)
@@ -457,7 +1096,10 @@ class TimeManagement:
     plt.savefig(os.path.join(self.save_path, "summary.jpg"))
     return
 
+  @traced
   def week_summary(self, td = DT.date.today()):
+    if self._panel_mode():
+      return self._week_summary_panels(td)
     fig = plt.figure(figsize=(100, 100))
     gs = gridspec.GridSpec(7, 2, figure=fig)
 
@@ -465,36 +1107,180 @@ class TimeManagement:
       date = td - DT.timedelta(days=7-i)
       ax = self.line_chart(self.app, date, ax=plt.subplot(gs[i, 0]))
       ax.legend().set_visible(i == 0)
-      self.pie_chart(self.app, date, plt.subplot(gs[i, 1]))
+      self.pie_chart(self.app, date, ax=plt.subplot(gs[i, 1]))
 
     fig.canvas.manager.set_window_title('Time Management')
     fig.set_size_inches(10, 13, forward=True)
     plt.tight_layout()
     plt.savefig(os.path.join(self.save_path, "week_report.jpg"))
 
+  def iter_app_chunks(self, chunksize=100_000):
+    """The whole history as raw frames of at most chunksize rows."""
+    if self.incremental:
+      self.ingest_incremental()
+      return self.history.iter_chunks(chunksize)
+    if self.export:
+      self.export_app_data(None, None)
+    return iter_applications_csv(os.path.join(self.root_path, "data", "applications.csv"), chunksize)
+
+  def all_time_seconds(self, chunksize=100_000, processes=None):
+    """Seconds per (Effective_Day, Tag) over the whole history, in bounded memory.
+
+    Each chunk is tagged, split into effective days and reduced to seconds
+    per (day, tag) right away; only those running totals are kept, never
+    the raw rows. processes, if given, is a set that collects the processes
+    seen.
+    """
+    if processes is None:
+      processes = set()
+    if self.db is not None and not self.export and not self.db.is_empty():
+      # grouped by SQLite, no rows leave the database
+      processes.update(self.db.processes())
+      return self.db.day_tag_seconds()
+    totals = None
+    process_tags = None
+    for chunk in self.iter_app_chunks(chunksize):
+      chunk = self.parse_titles(chunk)
+      if process_tags is None:
+        process_tags = self.load_process_tags(chunk)
+      process_tags = self.tagging(chunk, process_tags)
+      app = self.create_effective_day(self.merge_tags(chunk, process_tags))
+      processes.update(app.Process.dropna().astype(str).unique())
+      totals = fold(totals, day_tag_seconds(app))
+    return totals if totals is not None else pd.Series(dtype="int64")
+
+  def all_time_hours(self, chunksize=100_000):
+    """Effective_Day x Tag hours over the whole history."""
+    totals = self.all_time_seconds(chunksize)
+    return totals.unstack("Tag").fillna(0) / 3600 if not totals.empty else pd.DataFrame()
+
+  @traced
+  def refresh_rollups(self, chunksize=100_000, rebuild=False):
+    """Bring the rollups up to today.
+
+    Empty (or rebuild) rollups take one pass over the whole history, as do
+    rollups whose processes were tagged differently since; after that only
+    the days from the last stored one (still running when it was stored) to
+    today are loaded and processed.
+    """
+    today = pd.Timestamp(DT.date.today())
+    first, last = self.rollups.days()
+    if rebuild or first is None or self._rollups_stale():
+      processes = set()
+      seconds = self.all_time_seconds(chunksize, processes)
+      self.rollups.replace_days(seconds, meta=self._rollup_meta(processes, rebuild=True))
+    elif last < today:
+      app = self._load_range(last.date(), today.date(), os.path.join(self.root_path, "data", "applications_range.csv"))
+      seconds = day_tag_seconds(app)
+      seconds = seconds[seconds.index.get_level_values("Effective_Day") >= last]
+      self.rollups.replace_days(seconds, last, today, self._rollup_meta(app.Process.dropna().unique()))
+
+  @traced
+  def all_time(self, chunksize=100_000, rebuild=False):
+    self.refresh_rollups(chunksize, rebuild)
+    return self._all_time_chart(self.rollups.weekly_hours())
+
+  def all_time_trend(self, window=30, chunksize=100_000):
+    """Rolling mean hours per day and tag over window days (7 or 30)."""
+    self.refresh_rollups(chunksize)
+    mean = self.rollups.mean_hours(window)
+    fig = plt.figure(figsize=(20, 10))
+    ax = fig.add_subplot(1, 1, 1)
+    mean.plot(kind="line", grid=True, color=self._colors_for(mean.columns), ax=ax)
+    ax.set_ylim(bottom=0)
+    ax.set_xlabel("Effective Day")
+    ax.set_ylabel(f"Hours per day ({window} day mean)")
+    ax.legend(title="Tag", loc="upper left")
+    fig.canvas.manager.set_window_title("Time Management")
+    fig.tight_layout()
+    plt.savefig(os.path.join(self.save_path, f"all_time_mean_{window}.jpg"))
+    return ax
+
+  def _all_time_chart(self, weekly_df):
+    weekly_df = weekly_df.copy()
+    weekly_df.index = weekly_df.index.strftime("%Y-%m-%d")
+
+    fig = plt.figure(figsize=(12, 6))
+    gs = gridspec.GridSpec(1, 1, figure=fig)
+    ax = plt.subplot(gs[0, 0])
+
+    weekly_df.plot(kind="line", grid=True, color=self._colors_for(weekly_df.columns), ax=ax)
+    ax.set_ylabel("Hours")
+    ax.set_xlabel("Week")
+    ax.set_title("All-time weekly totals")
+    ax.legend(loc="upper left")
+    plt.xticks(rotation=45, ha="right")
+
+    fig.canvas.manager.set_window_title("Time Management")
+    fig.tight_layout()
+    plt.savefig(os.path.join(self.save_path, "all_time_weekly.jpg"))
+    return ax
+
+  # Several reports from one import
+  # ------------------------------------------------------------------
+  @traced
+  def run_reports(self, reports, td=None, month=None):
+    """Import the union of the reports' date ranges once, then render each.
+
+    reports: names from pipeline.REPORTS. In panel mode (render_workers or
+    render_cache) the panels of all reports are rendered together, so the
+    worker pool draws them concurrently; pyplot reports, the default with
+    render_workers=1, run one after the other (pyplot state is global) and
+    only share the import.
+    """
+    td = td or DT.date.today()
+    month = month or td.month
+    ranges = [report_range(r, td, month) for r in reports]
+    ranges = [r for r in ranges if r is not None]
+    if ranges:
+      self.import_and_preprocess(*union_range(ranges))
+    self._deferred = [] if self._panel_mode() else None
+    try:
+      for report in reports:
+        if report == "summary":
+          self.summary(td)
+        elif report == "week":
+          self.week_summary(td)
+        elif report == "three_week":
+          self.three_week_summary(td)
+        elif report == "month":
+          self.month_view(month)
+        elif report == "all_time":
+          self.all_time()
+      deferred, self._deferred = self._deferred, None
+      if deferred:
+        self._render_deferred(deferred)
+    finally:
+      self._deferred = None
+
+  def _render_deferred(self, reports):
+    specs = [spec for report_specs, _, _ in reports for spec in report_specs]
+    images = render_panels(specs, self.render_workers, self.render_cache)
+    start = 0
+    for report_specs, filename, size in reports:
+      end = start + len(report_specs)
+      composite(size or self.REPORT_SIZE, report_specs, images[start:end], os.path.join(self.save_path, filename))
+      start = end
+    if self.render_cache is not None:
+      stats = self.render_cache.stats()
+      print(f"Render cache after {len(reports)} reports: {stats['hits']} hits, {stats['misses']} misses")
+      self.render_cache.prune()
+
   # Graph Creation
   # ==================================================================
+  def _timeline(self, app):
+    """Cumulative timeline for app; built once and reused for self.app."""
+    if app is not getattr(self, "app", None):
+      return Timeline(app)
+    if getattr(self, "timeline", None) is None:
+      self.timeline = Timeline(app)
+    return self.timeline
+
   def line_chart(self, app, day, ax=None):
-    day = pd.to_datetime(day)
-    grouped_df = app[app["Effective_Day"]== day]
-
-    unique_tags = grouped_df['Tag'].unique()
-    new_entries = pd.DataFrame({
-        'Tag': unique_tags,
-        'Duration': pd.to_timedelta(np.zeros(len(unique_tags)), unit='s'),
-        'End': [grouped_df[grouped_df['Tag'] == tag]['Start'].min() for tag in unique_tags],
-        'Start': [grouped_df[grouped_df['Tag'] == tag]['Start'].min() for tag in unique_tags]
-    })
-    grouped_df = pd.concat([grouped_df, new_entries], ignore_index=True)
-    grouped_df = grouped_df.groupby(["Tag", "End"])["Duration"].sum().reset_index()
-    grouped_df["Duration"] = grouped_df["Duration"].dt.total_seconds()/3600
-    grouped_df.sort_values(by="End", inplace=True)
-    grouped_df["Cumulative Duration"] = grouped_df.groupby("Tag")["Duration"].cumsum()
-    pivot_df = grouped_df.pivot(index="End", columns="Tag", values="Cumulative Duration")
-    pivot_df = pivot_df.ffill()
+    pivot_df = self._timeline(app).day(day)
 
     if not pivot_df.empty:
-      ax = pivot_df.plot(kind="line", grid=True, color=self.colors, figsize=(10, 5), ax=ax)
+      ax = pivot_df.plot(kind="line", grid=True, color=self._colors_for(pivot_df.columns), figsize=(10, 5), ax=ax)
       ax.xaxis.set_major_formatter(mdates.DateFormatter('%H'))
       ax.set_xlabel("")
       ax.set_ylim(bottom=0)
@@ -502,19 +1288,24 @@ class TimeManagement:
       return ax
     return None
 
-  def pie_chart(self, app, day, full_day = 15, ax=None):
-    day = pd.to_datetime(day)
-    grouped_df = app.groupby(["Effective_Day", "Tag"])["Duration"].sum().reset_index()
-    grouped_df = grouped_df[grouped_df["Effective_Day"] == day]
-    grouped_df["Duration"] = grouped_df["Duration"].dt.total_seconds()/3600
-    grouped_df["Effective_Day"] = pd.to_datetime(grouped_df["Effective_Day"])
-    grouped_df = grouped_df.set_index("Tag", drop=True)
-    grouped_df.sort_values(by="Tag", inplace=True)
-
-    total_hours = grouped_df["Duration"].sum()
+  def _cube(self, app):
+    """Aggregate cube for app; reuses the one built at import for self.app."""
+    if app is getattr(self, "app", None) and getattr(self, "cube", None) is not None:
+      return self.cube
+    return build_cube(app)
+
+  def _pie_hours(self, app, day, full_day = 15):
+    """Hours per tag on day plus the untracked rest of full_day as "None"."""
+    hours = tag_hours(self._cube(app), pd.to_datetime(day))
+    total_hours = hours.sum()
     none_val = max(0.0, full_day - total_hours)
     if total_hours > 0 and none_val > 0:
-      grouped_df.loc["None"] = {"Effective_Day": day, "Duration": none_val}
+      hours.loc["None"] = none_val
+    return hours
+
+  def pie_chart(self, app, day, full_day = 15, ax=None):
+    day = pd.to_datetime(day)
+    grouped_df = self._pie_hours(app, day, full_day).to_frame("Duration")
 
     # map colors robustly (fallback to black)
     colors = [self.colors.get(tag, "black") for tag in grouped_df.index]
@@ -541,18 +1332,11 @@ class TimeManagement:
   def bar_chart(self, app, start_date=None, end_date=None, ax=None):
     start_date = pd.to_datetime(start_date)
     end_date = pd.to_datetime(end_date)
-
-    grouped_df = app.groupby(["Effective_Day", "Tag"])["Duration"].sum().reset_index()
-    grouped_df["Effective_Day"] = pd.to_datetime(grouped_df["Effective_Day"])
-    if start_date is not None:
-      grouped_df = grouped_df[grouped_df["Effective_Day"] > start_date]
-    if end_date is not None:
-      grouped_df = grouped_df[grouped_df["Effective_Day"] <= end_date]
-    grouped_df["Duration"] = grouped_df["Duration"].dt.total_seconds()/3600
-    pivot_df = grouped_df.pivot(index="Effective_Day", columns="Tag", values="Duration")
-    pivot_df.sort_index()
+    # days after start_date up to and including end_date
+    first_day = start_date + pd.Timedelta(days=1) if start_date is not None else None
+    pivot_df = day_tag_hours(self._cube(app), first_day, end_date)
     pivot_df.index = pivot_df.index.strftime("%a %d-%m")
-    ax = pivot_df.plot(kind="bar", stacked=False, figsize=(10, 5), grid=True, color=self.colors, ax=ax)
+    ax = pivot_df.plot(kind="bar", stacked=False, figsize=(10, 5), grid=True, color=self._colors_for(pivot_df.columns), ax=ax)
     ax.set_ylabel("")
     ax.set_xlabel("")
     ax.get_legend().remove()
@@ -561,37 +1345,198 @@ class TimeManagement:
 
   # Other
   # ==================================================================
+  # Live day chart
+  # ------------------------------------------------------------------
+  def _live_day(self):
+    return (pd.Timestamp.now() - pd.Timedelta(hours=self.day_start_hour)).floor('D')
+
+  def _reset_live(self, day):
+    self.live_day = day
+    self.live_end = None       # latest End ingested so far
+    self.live_timeline = None  # Timeline of the tagged rows ingested so far
+    for line in getattr(self, "day_lines", {}).values():
+      line.remove()
+    self.day_lines = {}
+
+  def _fetch_live_rows(self, day):
+    """Raw rows that may be new since the last tick; update_data drops the older ones.
+
+    Only the tail is parsed: the rows the history store just ingested, or
+    what was appended to the one-day export (or, debug, applications.csv)
+    since the previous tick, read through an AppendReader.
+    """
+    if self.incremental:
+      added = self.ingest_incremental()
+      return self.history.load(day.date(), None) if self.live_end is None else added
+    if self.export:
+      live_path = os.path.join(self.root_path, "data", "applications_live.csv")
+      self.export_app_data(day.date(), None, live_path)
+    else:
+      live_path = os.path.join(self.root_path, "data", "applications.csv")
+    if getattr(self, "live_reader", None) is None or self.live_reader.path != live_path:
+      self.live_reader = AppendReader(live_path)
+    rows, _ = self.live_reader.read()
+    return rows
+
   def update_data(self):
-    self.export_app_data()
-    self.load_files()
-    self.tagging()
-    self.merge_tags()
+    """Ingest the rows ending after the last seen End; returns them tagged.
+
+    Rows still running at the last tick come back clipped to start at it,
+    so only the new time is added to the running totals.
+    """
+    day = self._live_day()
+    if getattr(self, "live_day", None) != day:
+      self._reset_live(day)
+    app = rows_after(self._fetch_live_rows(day), self.live_end)
+    if self.live_end is None and not app.empty:
+      # first tick: the reader returned the whole file, keep the live day's rows
+      app = app[app.End > day + pd.Timedelta(hours=self.day_start_hour)]
+    if app.empty:
+      return app
+    end = app.End.max()
+    self.live_end = end if self.live_end is None else max(self.live_end, end)
+    app = self.parse_titles(app)
+    process_tags = self.tagging(app, self.load_process_tags(app))
+    app = self.merge_tags(app, process_tags)
+    app = self.create_effective_day(app)
+    return app[app.Effective_Day == self.live_day]
+
+  def _fit_live_limits(self, series):
+    """Grow the axes to the series; returns True when the limits changed."""
+    ax = self.day_ax
+    x_max = max(xs[-1] for xs, _ in series.values())
+    y_max = max(ys[-1] for _, ys in series.values())
+    x_lo, x_hi = ax.get_xlim()
+    _, y_hi = ax.get_ylim()
+    changed = False
+    if x_max > x_hi:
+      ax.set_xlim(x_lo, x_max + 1 / 24)
+      changed = True
+    if y_max > y_hi:
+      ax.set_ylim(0, y_max * 1.2)
+      changed = True
+    return changed
+
+  def _setup_day_chart(self, fig):
+    self.day_fig = fig
+    gs = gridspec.GridSpec(1, 1, figure=fig)
+    self.day_ax = fig.add_subplot(gs[0,0])
+    self.day_ax.grid(True)
+    self.day_ax.xaxis.set_major_formatter(mdates.DateFormatter('%H'))
+    self._reset_live(self._live_day())
+    start = mdates.date2num(self.live_day + pd.Timedelta(hours=self.day_start_hour))
+    self.day_ax.set_xlim(start, start + 1 / 24)
+    self.day_ax.set_ylim(0, 1)
 
   def continuous_day_chart(self):
     fig = plt.figure(figsize=(10, 5))
     fig.canvas.manager.set_window_title('Day Time Management')
-    gs = gridspec.GridSpec(1, 1, figure=fig)
-    self.day_today = DT.date.today()
-    self.day_ax = plt.subplot(gs[0,0])
-    ani = animation.FuncAnimation(fig, self.update_day_chart, interval=self.reloadTime*1000)
+    self._setup_day_chart(fig)
+    # blitting redraws only the lines; keep a reference so the animation is not collected
+    self.day_animation = animation.FuncAnimation(fig, self.update_day_chart, init_func=lambda: [],
+                                                 interval=self.reloadTime*1000, blit=True, cache_frame_data=False)
     plt.show()
     return
 
   def update_day_chart(self, *args):
-    self.update_data()
-    self.day_ax.clear()
-    self.line_chart(self.day_today, ax=self.day_ax)
-    return
+    day = self.live_day
+    app = self.update_data()
+    redraw = day != self.live_day
+    if redraw:
+      start = mdates.date2num(self.live_day + pd.Timedelta(hours=self.day_start_hour))
+      self.day_ax.set_xlim(start, start + 1 / 24)
+      self.day_ax.set_ylim(0, 1)
+    changed = set(app.Tag.dropna().unique()) if not app.empty else set()
+    if changed:
+      # the running totals continue from the previous tick: only app is grouped
+      if self.live_timeline is None:
+        self.live_timeline = Timeline(app, days=[self.live_day])
+      else:
+        self.live_timeline.extend(app)
+      series = {tag: (mdates.date2num(xs), ys) for tag, (xs, ys) in self.live_timeline.series(self.live_day).items()
+                if tag in changed}
+      for tag in changed:
+        line = self.day_lines.get(tag)
+        if line is None:
+          line, = self.day_ax.plot([], [], color=self.colors.get(tag), label=tag)
+          self.day_lines[tag] = line
+          redraw = True
+        line.set_data(*series[tag])
+      if self._fit_live_limits(series):
+        redraw = True
+    if redraw:
+      # new tags, a new day or grown limits: ticks and legend need a full draw
+      if self.day_lines:
+        self.day_ax.legend(loc='upper left')
+      self.day_fig.canvas.draw_idle()
+    return list(self.day_lines.values())
+
+  # Watch mode
+  # ------------------------------------------------------------------
+  @traced
+  def _prepare(self, raw):
+    """Tag, merge and split raw export rows (raw itself is left untouched)."""
+    app = self.parse_titles(raw.copy())  # tagging renames Obsidian processes in place
+    process_tags = self.tagging(app, self.load_process_tags(app))
+    app = self.merge_tags(app, process_tags)
+    return self.create_effective_day(app)
+
+  def watch(self, report, poll=0.25, debounce=0.3):
+    """Call report() again whenever the export, process_tags.csv or tag_rules.json change.
+
+    Only the stages depending on the changed file run: a grown export is
+    parsed from its appended bytes and just the new rows are tagged; a tag
+    or rule edit re-tags the parsed rows already in memory. Runs until
+    interrupted.
+    """
+    data = os.path.join(self.root_path, "data")
+    app_path = os.path.join(data, "applications.csv")
+    tag_paths = {os.path.join(data, "process_tags.csv"), os.path.join(data, "tag_rules.json")}
+    watcher = FileWatcher([app_path] + sorted(tag_paths), poll, debounce)
+    reader = AppendReader(app_path)
+    raw, changed = None, {app_path}
+    while True:
+      app = None
+      if app_path in changed:
+        rows, full = reader.read()
+        if full or raw is None:
+          raw = rows
+          app = self._prepare(raw)
+        else:
+          new = rows_after(rows, raw.End.max())
+          if not new.empty:
+            raw = pd.concat([raw, new], ignore_index=True)
+            new = self._prepare(new)
+            app = pd.concat([self.app, compact_frame(new) if self.compact else new], ignore_index=True)
+      if changed & tag_paths:
+        app = self._prepare(raw)
+      # tagging rewrites process_tags.csv itself
+      watcher.mark(tag_paths)
+      if app is not None:
+        self._set_app(app)
+        report()
+        print(f"{DT.datetime.now():%H:%M:%S} refreshed ({len(app)} rows)")
+      changed = watcher.wait()
 
 if __name__ == "__main__":
   # Configs:
   td = DT.date.today()
-  fd = td - DT.timedelta(days=24)
   reloadTime = 600
   root_path = "/Users/matar/Documents/PugiosDocuments/OwnProjects/TimeManagement"
   save_path = root_path
   colors = {"Game": "blue", "Main":"green", "Side Project": "red", "Browser": "orange", "Journaling": "yellow", "Other":"grey", "Social":"purple", "None": "black"}
   export = True
+  incremental = False
+  watch = False
+  all_time = False
+  trace = False
+  headless = False
+  review = False
+  backend = None
+  backfill_from = None
+  rebuild = False
+  mtc = MTC_PATH
+  render_workers = 1
   month = td.month
 
   for arg in sys.argv:
@@ -599,11 +1544,47 @@ if __name__ == "__main__":
       save_path = arg.split("=")[1]
     elif arg.startswith("-debug"):
       export = False
-
-  tm = TimeManagement(reloadTime, root_path, save_path, colors, export)
-
-  print(f"Data from: {fd} - {td}")
-  tm.import_and_preprocess(fd, td)
-  tm.three_week_summary(td)
-  tm.month_import_and_preprocess(month)
-  tm.month_view(month)
\ No newline at end of file
+    elif arg.startswith("-incremental"):
+      incremental = True
+    elif arg.startswith("-watch"):
+      watch = True
+    elif arg.startswith("-alltime"):
+      all_time = True
+    elif arg.startswith("-trace"):
+      trace = True
+    elif arg.startswith("-headless"):
+      headless = True
+    elif arg.startswith("-review"):
+      review = True
+    elif arg.startswith("-sqlite"):
+      backend = "sqlite"
+    elif arg.startswith("-shards"):
+      backend = "shards"
+    elif arg.startswith("-backfill"):
+      # -backfill=2024-01-01: parallel export from that day into the history store
+      backfill_from = DT.date.fromisoformat(arg.split("=")[1])
+      incremental = True
+    elif arg.startswith("-rebuild"):
+      # with -backfill: replace the stored history instead of extending it
+      rebuild = True
+    elif arg.startswith("-mtc"):
+      mtc = arg.split("=", 1)[1]
+    elif arg.startswith("-workers"):
+      # -workers=4: render the report panels in 4 processes (0 = one per CPU)
+      render_workers = int(arg.split("=")[1]) or None
+
+  tm = TimeManagement(reloadTime, root_path, save_path, colors, export, incremental=incremental, render_workers=render_workers, trace=trace, headless=headless, backend=backend, mtc=mtc)
+
+  if backfill_from is not None:
+    tm.backfill(backfill_from, td, rebuild=rebuild)
+
+  if review:
+    tm.review()
+    sys.exit()
+
+  if watch:
+    # refresh the three week summary on every change of the export or the tag files
+    tm.watch(lambda: tm.three_week_summary(DT.date.today()))
+
+  # one import for all reports
+  tm.run_reports(["three_week", "month"] + (["all_time"] if all_time else []), td, month)
\ No newline at end of file
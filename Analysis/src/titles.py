@@ -0,0 +1,88 @@
+"""Window titles parsed once into structured columns.
+
+ManicTime titles look like "<document> - <...> - <application>". Tagging and
+the merge rules used to split Name and try date formats row by row, several
+times per import. parse_titles does it once per distinct title and adds
+
+  Document      text before the first " - " (Obsidian: the note's file name)
+  App_Suffix    text after the last " - " (None without a separator)
+  Site          browser titles: the page title without the browser suffix
+  Is_Date_Note  Document is a date (daily note)
+
+The scalar helpers below serve code that handles single titles.
+"""
+import re
+import functools
+import datetime as DT
+import numpy as np
+import pandas as pd
+
+SEPARATOR = " - "
+DATE_NOTE_FORMATS = ("%d.%m.%Y", "%Y-%m-%d")
+BROWSER_SUFFIX = r"(?:Mozilla Firefox|Firefox Developer Edition|Firefox|Google Chrome|Microsoft Edge|Opera|Brave)"
+_SITE = re.compile(r"^(.*?)\s+[-—]\s+" + BROWSER_SUFFIX + r"$")
+TITLE_COLUMNS = ["Document", "App_Suffix", "Site", "Is_Date_Note"]
+
+
+@functools.lru_cache(maxsize=65536)
+def document(title):
+  return str(title).split(SEPARATOR)[0]
+
+
+@functools.lru_cache(maxsize=65536)
+def is_date_note(text):
+  """True if text matches one of DATE_NOTE_FORMATS."""
+  for fmt in DATE_NOTE_FORMATS:
+    try:
+      DT.datetime.strptime(text, fmt)
+      return True
+    except ValueError:
+      continue
+  return False
+
+
+def _parse_unique(titles):
+  """Title columns for an index of distinct titles."""
+  titles = pd.Series(titles, dtype=object).astype(str)
+  parts = pd.DataFrame(index=titles.index)
+  parts["Document"] = titles.str.split(SEPARATOR, n=1).str[0]
+  parts["App_Suffix"] = titles.str.extract(r"^.* - (.*)$", expand=False)
+  parts["Site"] = titles.str.extract(_SITE, expand=False)
+  docs = parts["Document"]
+  is_date = pd.Series(False, index=docs.index)
+  for fmt in DATE_NOTE_FORMATS:
+    is_date |= pd.to_datetime(docs, format=fmt, errors="coerce").notna()
+  parts["Is_Date_Note"] = is_date
+  return parts
+
+
+def parse_titles(app):
+  """Add TITLE_COLUMNS to app (in place), parsing every distinct Name once.
+
+  A categorical Name (compact layout) gives categorical text columns, built
+  from codes without materializing a string per row.
+  """
+  names = app["Name"]
+  categorical = isinstance(names.dtype, pd.CategoricalDtype)
+  if categorical:
+    # a missing Name (code -1) is parsed like "", as factorize below does
+    uniques = list(names.cat.categories.astype(object)) + [""]
+    codes = np.where(names.cat.codes.to_numpy() >= 0, names.cat.codes.to_numpy(), len(uniques) - 1)
+  else:
+    codes, uniques = pd.factorize(names.astype(object).fillna(""), sort=False)
+  parsed = _parse_unique(uniques)
+  for c in TITLE_COLUMNS:
+    if categorical and c != "Is_Date_Note":
+      cat = pd.Categorical(parsed[c])
+      app[c] = pd.Categorical.from_codes(cat.codes[codes], cat.categories)
+      continue
+    values = parsed[c].to_numpy()
+    app[c] = values[codes] if len(values) else np.array([], dtype=values.dtype)
+  return app
+
+
+def ensure_titles(app):
+  """parse_titles unless app already has the title columns."""
+  if all(c in app.columns for c in TITLE_COLUMNS):
+    return app
+  return parse_titles(app)
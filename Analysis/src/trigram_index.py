@@ -0,0 +1,109 @@
+"""Trigram similarity index for fuzzy project suggestions.
+
+Each entry is a text (a project name, or a window title seen for a project)
+pointing at a project. Texts are split into padded character trigrams with
+an inverted index trigram -> entries, so a lookup only touches the entries
+sharing a trigram with the query instead of comparing against every project.
+Scores are the Dice coefficient of the two trigram sets (1.0 = identical).
+
+The entries are persisted as JSON (data/.cache/trigrams.json by default);
+the postings are rebuilt on load.
+"""
+import os
+import re
+import json
+from collections import Counter
+
+VERSION = 1
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def trigrams(text):
+  """Set of padded trigrams of the normalized text."""
+  words = _NON_WORD.sub(" ", str(text).lower()).split()
+  grams = set()
+  for word in words:
+    padded = f"  {word} "
+    grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+  return grams
+
+
+class TrigramIndex:
+
+  def __init__(self):
+    self._entries = []      # [(text, project, n_trigrams)]
+    self._known = set()     # (normalized text, project) already indexed
+    self._postings = {}     # trigram -> [entry ids]
+    self.dirty = False
+
+  def __len__(self):
+    return len(self._entries)
+
+  def add(self, text, project):
+    """Index text as pointing at project; duplicates are ignored."""
+    if text is None or project is None or text != text or project != project:
+      return
+    key = (str(text).lower(), project)
+    if key in self._known:
+      return
+    grams = trigrams(text)
+    if not grams:
+      return
+    self._known.add(key)
+    k = len(self._entries)
+    self._entries.append((str(text), project, len(grams)))
+    for g in grams:
+      self._postings.setdefault(g, []).append(k)
+    self.dirty = True
+
+  def search(self, query, k=5, min_score=0.0):
+    """Top k [(project, score, matched text)], best score per project first."""
+    grams = trigrams(query)
+    if not grams:
+      return []
+    common = Counter()
+    for g in grams:
+      common.update(self._postings.get(g, ()))
+    best = {}
+    for entry, shared in common.items():
+      text, project, size = self._entries[entry]
+      score = 2.0 * shared / (len(grams) + size)
+      if score >= min_score and score > best.get(project, (0.0,))[0]:
+        best[project] = (score, text)
+    ranked = sorted(best.items(), key=lambda kv: kv[1][0], reverse=True)[:k]
+    return [(project, round(score, 4), text) for project, (score, text) in ranked]
+
+  def retain(self, projects):
+    """Drop the entries of projects not in projects (renamed or removed ones)."""
+    keep = [(text, project) for text, project, _ in self._entries if project in projects]
+    if len(keep) == len(self._entries):
+      return
+    self._entries, self._known, self._postings = [], set(), {}
+    for text, project in keep:
+      self.add(text, project)
+    self.dirty = True
+
+  # Persistence
+  # ------------------------------------------------------------------
+  def save(self, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+      json.dump({"version": VERSION, "entries": [[t, p] for t, p, _ in self._entries]}, fh)
+    os.replace(tmp, path)
+    self.dirty = False
+
+  @classmethod
+  def load(cls, path):
+    """Index stored at path, or an empty one."""
+    index = cls()
+    try:
+      with open(path, "r", encoding="utf-8") as fh:
+        data = json.load(fh)
+    except (OSError, ValueError):
+      return index
+    if data.get("version") == VERSION:
+      for text, project in data.get("entries", []):
+        index.add(text, project)
+    index.dirty = False
+    return index
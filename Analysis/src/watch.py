@@ -0,0 +1,55 @@
+"""Polling file watcher with debounce for watch mode.
+
+Watches a few files by (mtime, size); wait() returns once some of them
+changed and then stayed quiet for the debounce interval, so an export that
+is written in several steps triggers a single recomputation.
+"""
+import os
+import time
+
+
+class FileWatcher:
+
+  def __init__(self, paths, poll=0.25, debounce=0.3):
+    self.paths = list(paths)
+    self.poll = poll
+    self.debounce = debounce
+    self._seen = {}
+    self.mark()
+
+  @staticmethod
+  def _stamp(path):
+    try:
+      st = os.stat(path)
+    except OSError:
+      return None
+    return st.st_mtime_ns, st.st_size
+
+  def mark(self, paths=None):
+    """Take the current state of paths (default: all) as seen, e.g. after writing them ourselves."""
+    for path in self.paths if paths is None else paths:
+      self._seen[path] = self._stamp(path)
+
+  def changes(self):
+    """Paths whose stamp differs from the last one seen (non-blocking)."""
+    return {p for p in self.paths if self._stamp(p) != self._seen.get(p)}
+
+  def wait(self, timeout=None):
+    """Block until files changed and settled; returns the changed paths (empty on timeout)."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    changed, last = set(), None
+    while True:
+      now = self.changes()
+      if now:
+        stamps = {p: self._stamp(p) for p in now}
+        if stamps != last:
+          changed |= now
+          last, settle = stamps, time.monotonic() + self.debounce
+        elif time.monotonic() >= settle:
+          self.mark(changed)
+          return changed
+      else:
+        changed, last = set(), None  # changed back, nothing to do
+      if deadline is not None and time.monotonic() >= deadline:
+        return set()
+      time.sleep(self.poll)